@@ -25,6 +25,8 @@ a = Analysis(
         "uvicorn.logging",
         "uvicorn.loops",
         "uvicorn.loops.auto",
+        # uvicorn's "auto" loop picks uvloop when importable; make sure it is bundled
+        *(["uvloop", "uvicorn.loops.uvloop"] if platform.system() != "Windows" else []),
         "uvicorn.protocols",
         "uvicorn.protocols.http",
         "uvicorn.protocols.http.auto",
@@ -109,6 +109,18 @@ RATE_LIMITS: dict[str, tuple[float, float]] = {
     "career_page":   (3.0, 8.0),
 }
 
+# Sites paced by a token bucket instead of a random sleep per request:
+# site_key: (burst capacity, tokens refilled per second).  Lets concurrent
+# fetches burst briefly while holding the long-run request rate.
+RATE_BUCKETS: dict[str, tuple[float, float]] = {
+    "jobtoday":      (5.0, 2.0),
+    "lever":         (5.0, 2.0),
+    "infojobs":      (2.0, 0.2),
+    "lidl_es":       (5.0, 1.0),
+    "manfred":       (5.0, 1.0),
+    "mercadona":     (5.0, 0.5),
+}
+
 # Cookie TTL per site (hours)
 COOKIE_TTL: dict[str, int] = {
     "indeed_es":  24,
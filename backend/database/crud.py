@@ -3,9 +3,11 @@ from __future__ import annotations
 
 import hashlib
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Sequence
+from typing import Any, Callable, Optional, Sequence
 
 from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import StatementError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import (
@@ -61,6 +63,73 @@ async def upsert_job(db: AsyncSession, *, site: str, external_id: str, **kwargs:
     return job, True
 
 
+# Rows per INSERT statement — keeps bound parameters well under SQLite's limit
+_BULK_INSERT_CHUNK = 500
+
+
+async def bulk_insert_jobs(
+    db: AsyncSession,
+    rows: Sequence[dict[str, Any]],
+    on_error: Optional[Callable[[dict[str, Any], Exception], None]] = None,
+) -> set[tuple[str, str]]:
+    """Insert-or-ignore many jobs on (site, external_id) in as few statements as possible.
+
+    Returns the (site, external_id) keys that were actually inserted, i.e. the new jobs.
+    Keys that are not Job columns are dropped.  A row the database rejects (a
+    missing required column, a value of the wrong type) is skipped and passed
+    to *on_error*; the other rows are still inserted.
+    """
+    columns = set(Job.__table__.columns.keys()) - {"id"}
+    inserted: set[tuple[str, str]] = set()
+    chunk: list[dict[str, Any]] = []
+    for row in rows:
+        clean = {k: v for k, v in row.items() if k in columns}
+        clean.setdefault("status", JobStatus.scraped.value)
+        # Multi-VALUES inserts need every row to carry the same keys, so a
+        # different key set starts a new statement; absent columns keep their defaults
+        if chunk and (len(chunk) >= _BULK_INSERT_CHUNK or clean.keys() != chunk[0].keys()):
+            inserted |= await _insert_job_chunk(db, chunk, on_error)
+            chunk = []
+        chunk.append(clean)
+    if chunk:
+        inserted |= await _insert_job_chunk(db, chunk, on_error)
+    return inserted
+
+
+async def _insert_job_chunk(
+    db: AsyncSession,
+    chunk: list[dict[str, Any]],
+    on_error: Optional[Callable[[dict[str, Any], Exception], None]],
+) -> set[tuple[str, str]]:
+    """Insert one multi-VALUES chunk; if it fails, retry its rows one by one."""
+    stmt = (
+        sqlite_insert(Job)
+        .values(chunk)
+        .on_conflict_do_nothing(index_elements=["site", "external_id"])
+        .returning(Job.site, Job.external_id)
+    )
+    try:
+        async with db.begin_nested():
+            result = await db.execute(stmt)
+            return {(site, external_id) for site, external_id in result.all()}
+    except StatementError as exc:
+        if len(chunk) == 1:
+            if on_error is not None:
+                on_error(chunk[0], exc)
+            return set()
+
+    inserted: set[tuple[str, str]] = set()
+    for row in chunk:
+        inserted |= await _insert_job_chunk(db, [row], on_error)
+    return inserted
+
+
+async def get_known_external_ids(db: AsyncSession, site: str) -> set[str]:
+    """Return the external_ids already stored for *site* (served by the (site, external_id) index)."""
+    result = await db.execute(select(Job.external_id).where(Job.site == site))
+    return set(result.scalars().all())
+
+
 async def get_job(db: AsyncSession, job_id: int) -> Optional[Job]:
     result = await db.execute(select(Job).where(Job.id == job_id))
     return result.scalar_one_or_none()
@@ -138,10 +138,17 @@ async def lifespan(app: FastAPI):
         start_scheduler()
         log.info("scheduler.started")
 
+    # Move everything allocated during startup (ORM metadata, imported modules,
+    # scheduler) to the permanent generation so later collections skip it
+    gc.collect()
+    gc.freeze()
+
     yield
 
     # Shutdown
     log.info("jobbot.shutting_down")
+    from backend.scrapers.base import close_http_client
+    await close_http_client()
     gc.collect()
 
 
@@ -2,23 +2,45 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
+import re
 from typing import Any, Optional
 from urllib.parse import urljoin
 
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+from backend.scrapers.base import BaseScraper, JobRecord, classify, first_value, get_http_client
 from backend.scrapers.browser_pool import browser_pool
 
 log = structlog.get_logger(__name__)
 
+_HEADERS = {
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+    "Referer": "https://amazon.jobs/",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "X-Requested-With": "XMLHttpRequest",
+}
+
 SEARCH_URLS = [
     "https://amazon.jobs/en/search?country%5B%5D=ESP&category%5B%5D=software-development",
     "https://amazon.jobs/en/search?country%5B%5D=ESP&category%5B%5D=operations-it-support-and-engineering",
     "https://amazon.jobs/en/search?country%5B%5D=ESP&category%5B%5D=fulfillment-operations",
 ]
 
+# The SPA loads its listings from search.json — the only endpoint worth intercepting
+ROUTE_PATTERN = "**/search.json**"
+
+_PROFILE_RULES: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(r"software|engineer|developer|frontend|fullstack|sde|swe|react|python|java", re.I), "fullstack_dev"),
+    (re.compile(r"warehouse|fulfillment|almac[eé]n|logistics|log[ií]stica|operations|operaciones", re.I), "logistics"),
+]
+
 
 class AmazonESScraper(BaseScraper):
     """Scrape Amazon.jobs for Spain positions using stealth browser + API intercept."""
@@ -34,99 +56,86 @@ class AmazonESScraper(BaseScraper):
     # Main scrape
     # ------------------------------------------------------------------
 
-    async def scrape(self) -> list[dict]:
-        all_jobs: list[dict] = []
+    async def scrape(self) -> list[JobRecord]:
+        unique: dict[str, JobRecord] = {}
 
         # Try API-first approach (faster and more reliable when it works)
         api_jobs = await self._fetch_via_api()
         if api_jobs:
-            all_jobs.extend(api_jobs)
+            for job in api_jobs:
+                unique.setdefault(job.external_id, job)
             self._log.info("amazon_es.api_success", count=len(api_jobs))
         else:
             # Fall back to browser intercept
             self._log.info("amazon_es.falling_back_to_browser")
-            browser_jobs = await self._fetch_via_browser()
-            all_jobs.extend(browser_jobs)
-
-        # Deduplicate
-        seen: set[str] = set()
-        unique: list[dict] = []
-        for job in all_jobs:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
+            for job in await self._fetch_via_browser():
+                unique.setdefault(job.external_id, job)
 
         self._log.info("amazon_es.total", total=len(unique))
-        return unique
+        return list(unique.values())
 
     # ------------------------------------------------------------------
     # Strategy 1: Direct JSON API
     # ------------------------------------------------------------------
 
-    async def _fetch_via_api(self) -> list[dict]:
+    async def _fetch_via_api(self) -> list[JobRecord]:
         """Call Amazon Jobs JSON search API directly."""
-        import httpx
-
-        jobs: list[dict] = []
+        jobs: dict[str, JobRecord] = {}
         categories = [
             "software-development",
             "operations-it-support-and-engineering",
             "fulfillment-operations",
         ]
-        headers = {
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
-            "Referer": "https://amazon.jobs/",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0.0.0 Safari/537.36"
-            ),
-            "X-Requested-With": "XMLHttpRequest",
-        }
-
-        async with httpx.AsyncClient(headers=headers, follow_redirects=True, timeout=30.0) as client:
-            for category in categories:
-                offset = 0
-                page_size = 10
-
-                while True:
-                    params: dict[str, Any] = {
-                        "country[]": "ESP",
-                        "category[]": category,
-                        "offset": offset,
-                        "result_limit": page_size,
-                        "sort": "relevant",
-                    }
-                    try:
-                        resp = await client.get(self.API_BASE, params=params)
-                        if resp.status_code != 200:
-                            self._log.debug("amazon_es.api_not_200", status=resp.status_code)
-                            return []
-                        data = resp.json()
-                    except Exception as exc:
-                        self._log.debug("amazon_es.api_exception", error=str(exc))
-                        return []
-
-                    page_jobs = self._parse_api_response(data)
-                    if not page_jobs:
-                        break
-
-                    jobs.extend(page_jobs)
-                    offset += page_size
-
-                    total = data.get("count") or data.get("hits") or 0
-                    if offset >= total or len(page_jobs) < page_size:
-                        break
-
-                    await self._rate_limit()
-
-                await self._rate_limit()
-
-        return jobs
-
-    def _parse_api_response(self, data: Any) -> list[dict]:
+        page_size = 10
+        # Caps in-flight page requests once a category's total is known
+        sem = asyncio.Semaphore(5)
+
+        async def fetch_page(client: Any, category: str, offset: int) -> Optional[Any]:
+            params: dict[str, Any] = {
+                "country[]": "ESP",
+                "category[]": category,
+                "offset": offset,
+                "result_limit": page_size,
+                "sort": "relevant",
+            }
+            async with sem:
+                try:
+                    resp = await client.get(self.API_BASE, params=params, headers=_HEADERS)
+                    if resp.status_code != 200:
+                        self._log.debug("amazon_es.api_not_200", status=resp.status_code)
+                        return None
+                    return orjson.loads(resp.content)
+                except Exception as exc:
+                    self._log.debug("amazon_es.api_exception", error=str(exc))
+                    return None
+
+        client = get_http_client()
+        for category in categories:
+            # Page 0 tells us the total; the remaining offsets are fetched concurrently
+            data = await fetch_page(client, category, 0)
+            if data is None:
+                return []
+
+            page_jobs = self._parse_api_response(data)
+            for job in page_jobs:
+                jobs.setdefault(job.external_id, job)
+
+            total = (data.get("count") or data.get("hits") or 0) if isinstance(data, dict) else 0
+            if len(page_jobs) >= page_size and total > page_size:
+                pages = await asyncio.gather(
+                    *(fetch_page(client, category, offset) for offset in range(page_size, total, page_size))
+                )
+                if any(page is None for page in pages):
+                    return []
+                for page in pages:
+                    for job in self._parse_api_response(page):
+                        jobs.setdefault(job.external_id, job)
+
+            await self._rate_limit()
+
+        return list(jobs.values())
+
+    def _parse_api_response(self, data: Any) -> list[JobRecord]:
         raw_list: list[dict] = []
 
         if isinstance(data, dict):
@@ -134,7 +143,7 @@ class AmazonESScraper(BaseScraper):
         elif isinstance(data, list):
             raw_list = data
 
-        result: list[dict] = []
+        result: list[JobRecord] = []
         for raw in raw_list:
             job = self._normalise_job(raw)
             if job:
@@ -145,20 +154,25 @@ class AmazonESScraper(BaseScraper):
     # Strategy 2: Stealth browser with route intercept
     # ------------------------------------------------------------------
 
-    async def _fetch_via_browser(self) -> list[dict]:
+    async def _fetch_via_browser(self) -> list[JobRecord]:
         context = await browser_pool.get_context(self.SITE)
         page = await context.new_page()
-        captured_jobs: list[dict] = []
+        captured_jobs: list[JobRecord] = []
 
         async def handle_route(route: Any, request: Any) -> None:
+            if "search.json" not in request.url:
+                await route.continue_()
+                return
             try:
                 response = await route.fetch()
                 body = await response.body()
                 try:
-                    data = json.loads(body)
-                    page_jobs = self._parse_api_response(data)
+                    # Large payloads: decode + normalise in a worker thread so the loop stays responsive
+                    page_jobs = await asyncio.to_thread(
+                        lambda: self._parse_api_response(orjson.loads(body))
+                    )
                     captured_jobs.extend(page_jobs)
-                except (json.JSONDecodeError, ValueError):
+                except orjson.JSONDecodeError:
                     pass
                 await route.fulfill(response=response)
             except Exception as exc:
@@ -169,17 +183,19 @@ class AmazonESScraper(BaseScraper):
                     pass
 
         try:
-            await page.route("**/api/jobs**", handle_route)
-            await page.route("**/search.json**", handle_route)
-            await page.route("**/jobs/search**", handle_route)
+            # Context-level so the route covers every page without re-registration
+            await context.route(ROUTE_PATTERN, handle_route)
 
             for url in SEARCH_URLS:
                 self._log.info("amazon_es.navigating", url=url)
                 try:
-                    await page.goto(url, wait_until="networkidle", timeout=60_000)
-                    # Amazon is a heavy React SPA — wait extra
-                    await asyncio.sleep(3)
-                    await page.wait_for_load_state("networkidle", timeout=30_000)
+                    # Resolve as soon as the SPA's listing call lands; handle_route
+                    # has already parsed it by the time the response is delivered
+                    async with page.expect_response(
+                        lambda r: "search.json" in r.url and r.status == 200,
+                        timeout=30_000,
+                    ):
+                        await page.goto(url, wait_until="domcontentloaded", timeout=60_000)
                 except Exception as exc:
                     self._log.warning("amazon_es.navigation_error", url=url, error=str(exc))
                     continue
@@ -198,11 +214,16 @@ class AmazonESScraper(BaseScraper):
         except Exception as exc:
             self._log.exception("amazon_es.browser_error", error=str(exc))
         finally:
+            # The context outlives this scrape — release the handler explicitly
+            try:
+                await context.unroute(ROUTE_PATTERN, handle_route)
+            except Exception:
+                pass
             try:
                 await page.close()
             except Exception:
                 pass
-            await browser_pool.close_context(self.SITE)
+            # The context stays warm in the pool; BrowserPool recycles it by age / page count
 
         return captured_jobs
 
@@ -210,34 +231,23 @@ class AmazonESScraper(BaseScraper):
     # Normalisation
     # ------------------------------------------------------------------
 
-    def _normalise_job(self, raw: dict) -> Optional[dict]:
-        external_id = str(
-            raw.get("id_icims")
-            or raw.get("id")
-            or raw.get("jobId")
-            or raw.get("requisitionId")
-            or ""
-        )
+    def _normalise_job(self, raw: dict) -> Optional[JobRecord]:
+        external_id = str(first_value(raw, ("id_icims", "id", "jobId", "requisitionId")))
         if not external_id:
             return None
 
-        title = raw.get("title") or raw.get("job_title") or ""
+        title = first_value(raw, ("title", "job_title"))
         company = "Amazon"
 
-        location_raw = raw.get("location") or raw.get("normalized_location") or raw.get("city") or ""
+        location_raw = first_value(raw, ("location", "normalized_location", "city"))
         if isinstance(location_raw, list):
             location_raw = ", ".join(str(x) for x in location_raw)
         elif isinstance(location_raw, dict):
             location_raw = location_raw.get("label") or location_raw.get("name") or "España"
 
-        description = (
-            raw.get("description")
-            or raw.get("job_description")
-            or raw.get("summary")
-            or ""
-        )
+        description = first_value(raw, ("description", "job_description", "summary"))
 
-        url_path = raw.get("job_path") or raw.get("url") or ""
+        url_path = first_value(raw, ("job_path", "url"))
         url = (
             (self.BASE_URL + url_path)
             if url_path and not url_path.startswith("http")
@@ -246,28 +256,26 @@ class AmazonESScraper(BaseScraper):
 
         cv_profile = self._assign_cv_profile(title)
 
-        return {
-            "site": self.SITE,
-            "external_id": external_id,
-            "url": url,
-            "title": title,
-            "company": company,
-            "location": location_raw,
-            "description": description,
-            "salary_raw": None,
-            "contract_type": raw.get("employment_type") or raw.get("job_category"),
-            "cv_profile": cv_profile,
-            "raw_data": raw,
-        }
+        return JobRecord(
+            site=self.SITE,
+            external_id=external_id,
+            url=url,
+            title=title,
+            company=company,
+            location=location_raw,
+            description=description,
+            salary_raw=None,
+            contract_type=first_value(raw, ("employment_type", "job_category"), None),
+            cv_profile=cv_profile,
+            raw_data=raw if self.STORE_RAW else None,
+        )
 
     # ------------------------------------------------------------------
     # CV profile assignment
     # ------------------------------------------------------------------
 
-    def _assign_cv_profile(self, title: str) -> str:
-        t = title.lower()
-        if any(kw in t for kw in ["software", "engineer", "developer", "frontend", "fullstack", "sde", "swe", "react", "python", "java"]):
-            return "fullstack_dev"
-        if any(kw in t for kw in ["warehouse", "fulfillment", "almacén", "almacen", "logistics", "logística", "operations", "operaciones"]):
-            return "logistics"
-        return "logistics"
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _assign_cv_profile(title: str) -> str:
+        # Amazon reuses a small set of titles across hundreds of postings
+        return classify(title, _PROFILE_RULES, "logistics")
@@ -3,29 +3,222 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import dataclasses
+import functools
 import gc
 import hashlib
 import json
 import random
+import re
 import time
 from pathlib import Path
 from typing import Any, Optional
 
 import structlog
 
-from backend.config import COOKIE_TTL, RATE_LIMITS
+from backend.config import COOKIE_TTL, RATE_BUCKETS, RATE_LIMITS
 from backend.database.crud import (
+    bulk_insert_jobs,
     finish_scraper_run,
+    get_known_external_ids,
     get_latest_scraper_run,
     start_scraper_run,
-    upsert_job,
 )
-from backend.database.models import Job, JobStatus, ScraperRun, ScraperRunStatus
+from backend.database.models import JobStatus, ScraperRun, ScraperRunStatus
 from backend.scrapers.visa_filter import is_eligible
 
 log = structlog.get_logger(__name__)
 
 
+def first_value(data: dict, keys: tuple[str, ...], default: Any = "") -> Any:
+    """Return the first truthy ``data[key]`` for *keys*, else *default*.
+
+    Equivalent to ``data.get(a) or data.get(b) or ... or default`` without
+    building the whole chain of lookups on every call.
+    """
+    get = data.get
+    for key in keys:
+        value = get(key)
+        if value:
+            return value
+    return default
+
+
+def keyword_pattern(keywords: list[str]) -> re.Pattern[str]:
+    """Compile *keywords* into one alternation for substring matching.
+
+    ``pattern.search(text)`` is equivalent to ``any(kw in text for kw in
+    keywords)`` but scans the text once.  Keywords are matched literally.
+    """
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+def classify(text: str, rules: list[tuple[re.Pattern[str], str]], default: str) -> str:
+    """Return the label of the first rule whose pattern matches *text*, else *default*.
+
+    *text* is searched as given; callers lowercase or :func:`fold` it to suit
+    their keyword lists.
+    """
+    for pattern, label in rules:
+        if pattern.search(text):
+            return label
+    return default
+
+
+# Spanish accents folded to ASCII, so keyword lists need one spelling per word
+_FOLD = str.maketrans("áéíóúüñÁÉÍÓÚÜÑ", "aeiouunAEIOUUN")
+
+
+def fold(text: str) -> str:
+    """Lowercase *text* and strip Spanish diacritics for keyword matching."""
+    return text.translate(_FOLD).lower()
+
+
+@functools.lru_cache(maxsize=4096)
+def synthetic_id(*parts: str) -> str:
+    """Stable 32-hex-char id for jobs whose source exposes no id of its own.
+
+    SHA-256 of the ``|``-joined parts, truncated: the digest stored ids were
+    built with, so they must not change.  Cached because listings repeat the
+    same title/company pairs across pages and runs.
+    """
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+@dataclasses.dataclass(slots=True)
+class JobRecord:
+    """Normalised job produced by a scraper.
+
+    Slotted to keep per-job overhead low while results sit in memory;
+    :meth:`BaseScraper.run` turns it into a row dict at the DB boundary.
+    """
+
+    site: str
+    external_id: str
+    url: str
+    title: str
+    company: str
+    location: str
+    description: Optional[str]
+    salary_raw: Optional[str]
+    contract_type: Optional[str]
+    cv_profile: str
+    raw_data: Optional[dict]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Shallow dict view (``dataclasses.asdict`` would deep-copy raw_data)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# ---------------------------------------------------------------------------
+# Shared HTTP client
+# ---------------------------------------------------------------------------
+
+DEFAULT_HEADERS = {
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    ),
+}
+
+# Process-wide so TCP/TLS connections stay warm across scrapers and runs
+_http_client: Optional[Any] = None
+
+
+def get_http_client() -> Any:
+    """Return the shared httpx client for API scrapers, creating it lazily.
+
+    Scrapers pass their site-specific headers per request.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+
+        _http_client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# ---------------------------------------------------------------------------
+# Conditional GETs
+# ---------------------------------------------------------------------------
+
+# url → (validator headers, parsed result) from the last 200 response.
+# Process-wide: scraper instances are rebuilt for every run.
+_conditional_cache: dict[str, tuple[dict[str, str], Any]] = {}
+
+
+def conditional_headers(url: str, headers: dict[str, str]) -> dict[str, str]:
+    """*headers* plus If-None-Match/If-Modified-Since from *url*'s last 200 response."""
+    entry = _conditional_cache.get(url)
+    if entry is None:
+        return headers
+    return {**headers, **entry[0]}
+
+
+def cached_result(url: str) -> Any:
+    """Parsed result stored for *url*; call on a 304 to a conditional request."""
+    return _conditional_cache[url][1]
+
+
+def remember_result(url: str, response: Any, result: Any) -> None:
+    """Store *result* with *response*'s validators so the next GET can revalidate."""
+    validators: dict[str, str] = {}
+    etag = response.headers.get("ETag")
+    if etag:
+        validators["If-None-Match"] = etag
+    last_modified = response.headers.get("Last-Modified")
+    if last_modified:
+        validators["If-Modified-Since"] = last_modified
+    if validators:
+        _conditional_cache[url] = (validators, result)
+    else:
+        _conditional_cache.pop(url, None)
+
+
+class TokenBucket:
+    """Async token-bucket limiter.
+
+    Up to *capacity* acquisitions go through immediately; beyond that callers
+    wait for tokens refilled at *refill_rate* per second.  Safe to share
+    between concurrent tasks.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float) -> None:
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.refill_rate)
+                self.last = now
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                await asyncio.sleep((cost - self.tokens) / self.refill_rate)
+
+
 class BaseScraper(abc.ABC):
     """Abstract base class for all JobBot scrapers.
 
@@ -33,11 +226,16 @@ class BaseScraper(abc.ABC):
     """
 
     SITE: str = ""
+    # Keep the full upstream payload in Job.raw_data.  Off by default: nothing
+    # reads it back, and it dominates memory on large sweeps.
+    STORE_RAW: bool = False
 
     def __init__(self, site: str, db_session_factory: Any) -> None:
         self.site = site
         self.db_session_factory = db_session_factory
         self._log = log.bind(site=self.site)
+        bucket = RATE_BUCKETS.get(site)
+        self._bucket: Optional[TokenBucket] = TokenBucket(*bucket) if bucket else None
 
     # ------------------------------------------------------------------
     # Public entry point
@@ -71,33 +269,58 @@ class BaseScraper(abc.ABC):
             run = await start_scraper_run(db, self.site)
             await db.commit()
 
+            # Jobs stored by earlier runs — skipped below before any filtering work
+            known_ids = await get_known_external_ids(db, self.site)
+
         try:
             self._log.info("scraper.scraping")
-            jobs: list[dict] = await self.scrape()
-            gc.collect()
+            jobs: list[dict | JobRecord] = await self.scrape()
+
+            # Build all rows first, then insert them in one batched statement
+            rows: list[dict] = []
+            eligible_keys: set[tuple[str, str]] = set()
+            for job in jobs:
+                try:
+                    job_data = job.as_dict() if isinstance(job, JobRecord) else job
+                    if (
+                        job_data.get("external_id") in known_ids
+                        and (job_data.get("site") or self.site) == self.site
+                    ):
+                        continue
+                    eligible, reason = is_eligible(job_data)
+                    if not eligible:
+                        self._log.info(
+                            "scraper.job_skipped_visa_filter",
+                            title=job_data.get("title", ""),
+                            company=job_data.get("company", ""),
+                            reason=reason,
+                        )
+                        job_data["status"] = JobStatus.skipped.value
+                        # A fresh dict: raw_data may be shared with the scraper,
+                        # e.g. a page's jobs kept for conditional GETs
+                        raw_data = job_data.get("raw_data")
+                        job_data["raw_data"] = {
+                            **(raw_data if isinstance(raw_data, dict) else {}),
+                            "_skip_reason": reason,
+                        }
+                    row = self._job_row(job_data)
+                    rows.append(row)
+                    if eligible:
+                        eligible_keys.add((row["site"], row["external_id"]))
+                except Exception as exc:
+                    self._log.warning("scraper.job_save_error", error=str(exc))
+
+            def log_save_error(row: dict, exc: Exception) -> None:
+                self._log.warning(
+                    "scraper.job_save_error",
+                    external_id=row.get("external_id"),
+                    error=str(exc),
+                )
 
-            jobs_new = 0
             async with self.db_session_factory() as db:
-                for job_data in jobs:
-                    try:
-                        eligible, reason = is_eligible(job_data)
-                        if not eligible:
-                            self._log.info(
-                                "scraper.job_skipped_visa_filter",
-                                title=job_data.get("title", ""),
-                                company=job_data.get("company", ""),
-                                reason=reason,
-                            )
-                            job_data["status"] = JobStatus.skipped.value
-                            job_data.setdefault("raw_data", {})
-                            if isinstance(job_data.get("raw_data"), dict):
-                                job_data["raw_data"]["_skip_reason"] = reason
-                        _job, is_new = await self._dedup_job(db, job_data)
-                        if is_new and eligible:
-                            jobs_new += 1
-                    except Exception as exc:
-                        self._log.warning("scraper.job_save_error", error=str(exc))
+                inserted = await bulk_insert_jobs(db, rows, on_error=log_save_error)
                 await db.commit()
+            jobs_new = len(inserted & eligible_keys)
 
             stats["jobs_found"] = len(jobs)
             stats["jobs_new"] = jobs_new
@@ -144,15 +367,22 @@ class BaseScraper(abc.ABC):
     # ------------------------------------------------------------------
 
     @abc.abstractmethod
-    async def scrape(self) -> list[dict]:
-        """Perform the actual scraping.  Return a list of raw job dicts."""
+    async def scrape(self) -> list[dict | JobRecord]:
+        """Perform the actual scraping.  Return a list of job dicts or :class:`JobRecord`."""
 
     # ------------------------------------------------------------------
     # Rate limiting
     # ------------------------------------------------------------------
 
     async def _rate_limit(self) -> None:
-        """Sleep for a random duration within this site's configured rate limits."""
+        """Wait out this site's rate limit.
+
+        Sites listed in ``RATE_BUCKETS`` draw from a shared token bucket;
+        the rest sleep a random duration within ``RATE_LIMITS``.
+        """
+        if self._bucket is not None:
+            await self._bucket.acquire()
+            return
         low, high = RATE_LIMITS.get(
             self.site,
             (3.0, 8.0),
@@ -171,7 +401,9 @@ class BaseScraper(abc.ABC):
         Returns True if the structure appears stable, False if a >30 % change
         is detected (which indicates a site layout change worth alerting on).
         """
-        current_hash = hashlib.sha256(content.encode("utf-8", errors="replace")).hexdigest()
+        # hashlib is OpenSSL-backed, which uses SHA-NI where the CPU provides it
+        current_digest = hashlib.sha256(content.encode("utf-8", errors="replace")).digest()
+        current_hash = current_digest.hex()  # scraper_runs.structure_hash is String(64)
 
         async with self.db_session_factory() as db:
             latest = await get_latest_scraper_run(db, self.site)
@@ -187,10 +419,14 @@ class BaseScraper(abc.ABC):
             self._log.debug("scraper.structure_hash_baseline", hash=current_hash[:16])
             return True
 
-        # Simple Hamming-distance approximation by comparing hex nibbles
-        if len(current_hash) == len(previous_hash):
-            mismatches = sum(a != b for a, b in zip(current_hash, previous_hash))
-            change_ratio = mismatches / len(current_hash)
+        # Bitwise Hamming distance between the two 256-bit digests
+        try:
+            previous_digest = bytes.fromhex(previous_hash)
+        except ValueError:
+            previous_digest = b""
+        if len(current_digest) == len(previous_digest):
+            diff = int.from_bytes(current_digest, "big") ^ int.from_bytes(previous_digest, "big")
+            change_ratio = diff.bit_count() / (len(current_digest) * 8)
         else:
             change_ratio = 1.0
 
@@ -232,15 +468,18 @@ class BaseScraper(abc.ABC):
     # Deduplication
     # ------------------------------------------------------------------
 
-    async def _dedup_job(self, db: Any, job_data: dict) -> tuple[Job, bool]:
-        """Upsert a job and return (job, is_new).
+    def _job_row(self, job_data: dict) -> dict:
+        """Return *job_data* as a row for :func:`bulk_insert_jobs`.
 
+        Dedup happens in the insert itself (ON CONFLICT on site + external_id).
         Expects job_data to contain at minimum:
           site, external_id, url, title, company
         """
-        site = job_data.pop("site", self.site)
-        external_id = job_data.pop("external_id")
-        return await upsert_job(db, site=site, external_id=external_id, **job_data)
+        return {
+            **job_data,
+            "site": job_data.get("site") or self.site,
+            "external_id": job_data["external_id"],
+        }
 
     # ------------------------------------------------------------------
     # Consecutive-zero guard
@@ -1,9 +1,8 @@
-"""Patchright (stealth Playwright) browser pool with cookie persistence."""
+"""Patchright (stealth Playwright) browser pool with storage-state persistence."""
 from __future__ import annotations
 
 import asyncio
 import gc
-import json
 import time
 from pathlib import Path
 from typing import Any, Optional
@@ -15,6 +14,7 @@ try:
         async_playwright,
         BrowserContext,
         Playwright as AsyncPlaywright,
+        TimeoutError as PlaywrightTimeoutError,
     )
     _PATCHRIGHT_AVAILABLE = True
 except ImportError:
@@ -23,6 +23,7 @@ except ImportError:
             async_playwright,
             BrowserContext,
             Playwright as AsyncPlaywright,
+            TimeoutError as PlaywrightTimeoutError,
         )
         _PATCHRIGHT_AVAILABLE = False
         structlog.get_logger(__name__).warning(
@@ -73,33 +74,79 @@ USER_AGENTS: list[str] = [
 ]
 
 
+async def wait_for_idle(page: Any, timeout_ms: int = 2500) -> None:
+    """Give *page* a short, bounded chance to reach networkidle.
+
+    Pages with long-polling or ad trackers never go idle; rather than paying a
+    full navigation timeout, stop waiting after *timeout_ms* and carry on.
+    """
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        pass
+
+
+# Asset URLs aborted in every scraping context (no effect on DOM or JSON data).
+# Matched by extension so no other request is routed through Python.
+BLOCKED_ASSET_GLOB = "**/*.{png,jpg,jpeg,gif,webp,svg,ico,woff,woff2,ttf,otf,mp4,webm}"
+
+
 class BrowserPool:
     """Singleton-style pool that manages a single Chromium instance with
-    per-site browser contexts.  Cookies are persisted to disk and reloaded
-    on subsequent runs (respecting COOKIE_TTL per site).
+    per-site browser contexts.  Storage state (cookies + localStorage) is
+    persisted to disk and reloaded on subsequent runs (respecting COOKIE_TTL
+    per site).
     """
 
     _playwright: Optional[Any] = None          # AsyncPlaywright instance
     _browser: Optional[Any] = None             # Browser instance
     _contexts: dict[str, Any] = {}             # site → BrowserContext
+    _context_created: dict[str, float] = {}    # site → monotonic creation time
+    _pages_served: dict[str, int] = {}         # site → pages opened on the context
     _lock: asyncio.Lock = asyncio.Lock()
 
+    # Warm contexts are reused across scrapes, then recycled to bound the
+    # memory that route handlers and page state accumulate in the driver.
+    CONTEXT_MAX_AGE_SECONDS: float = 30 * 60
+    CONTEXT_MAX_PAGES: int = 50
+
     # ------------------------------------------------------------------
     # Context lifecycle
     # ------------------------------------------------------------------
 
     async def get_context(self, site: str) -> Any:
-        """Return (or create) a BrowserContext for *site*."""
+        """Return (or create) a BrowserContext for *site*.
+
+        A cached context is reused until it is older than CONTEXT_MAX_AGE_SECONDS
+        or has served more than CONTEXT_MAX_PAGES pages; it is then saved and recreated.
+        """
         async with self._lock:
             if site in self._contexts:
-                return self._contexts[site]
+                age = time.monotonic() - self._context_created.get(site, 0.0)
+                pages = self._pages_served.get(site, 0)
+                if age <= self.CONTEXT_MAX_AGE_SECONDS and pages <= self.CONTEXT_MAX_PAGES:
+                    return self._contexts[site]
+                log.debug("browser_pool.context_recycled", site=site, age_seconds=round(age), pages=pages)
+                stale = self._contexts.pop(site)
+                await self.save_cookies(site, stale)
+                try:
+                    await stale.close()
+                except Exception as exc:
+                    log.warning("browser_pool.context_close_error", site=site, error=str(exc))
 
             await self._ensure_browser()
 
             import random
             user_agent = random.choice(USER_AGENTS)
 
-            context: Any = await self._browser.new_context(  # type: ignore[union-attr]
+            # Restore saved session state (cookies + localStorage) in one step
+            state_path = self._fresh_state_path(site)
+            if state_path:
+                log.debug("browser_pool.state_loaded", site=site)
+            else:
+                log.debug("browser_pool.state_fresh", site=site)
+
+            context_options: dict[str, Any] = dict(
                 user_agent=user_agent,
                 locale="es-ES",
                 timezone_id="Europe/Madrid",
@@ -111,6 +158,18 @@ class BrowserPool:
                     "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
                 },
             )
+            try:
+                context: Any = await self._browser.new_context(  # type: ignore[union-attr]
+                    **context_options,
+                    storage_state=str(state_path) if state_path else None,
+                )
+            except Exception as exc:
+                if not state_path:
+                    raise
+                # Corrupt or half-written state file: drop it and start fresh
+                log.warning("browser_pool.state_load_error", site=site, error=str(exc))
+                state_path.unlink(missing_ok=True)
+                context = await self._browser.new_context(**context_options)  # type: ignore[union-attr]
 
             # Inject stealth JS to mask automation signals
             await context.add_init_script("""
@@ -120,45 +179,40 @@ class BrowserPool:
                 window.chrome = { runtime: {} };
             """)
 
-            # Load saved cookies if not expired
-            cookies_loaded = await self._load_cookies(site, context)
-            if cookies_loaded:
-                log.debug("browser_pool.cookies_loaded", site=site)
-            else:
-                log.debug("browser_pool.cookies_fresh", site=site)
+            # Skip asset downloads scrapers never look at. Registered first so
+            # site-specific routes added later take precedence for their patterns.
+            await context.route(BLOCKED_ASSET_GLOB, lambda route: route.abort())
 
             self._contexts[site] = context
+            self._context_created[site] = time.monotonic()
+            self._pages_served[site] = 0
+            context.on("page", lambda _page: self._count_page(site))
             log.info("browser_pool.context_created", site=site)
             return context
 
     async def save_cookies(self, site: str, context: Any) -> None:
-        """Persist cookies for *site* to disk."""
-        cookies_dir = BROWSER_PROFILES_DIR / site
-        cookies_dir.mkdir(parents=True, exist_ok=True)
-        cookies_file = cookies_dir / "cookies.json"
+        """Persist the storage state (cookies + localStorage) for *site* to disk."""
+        state_dir = BROWSER_PROFILES_DIR / site
+        state_dir.mkdir(parents=True, exist_ok=True)
 
         try:
-            cookies = await context.cookies()
-            payload = {
-                "saved_at": time.time(),
-                "cookies": cookies,
-            }
-            cookies_file.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-            log.debug("browser_pool.cookies_saved", site=site, count=len(cookies))
+            await context.storage_state(path=str(state_dir / "state.json"))
+            log.debug("browser_pool.state_saved", site=site)
         except Exception as exc:
-            log.warning("browser_pool.cookies_save_error", site=site, error=str(exc))
+            log.warning("browser_pool.state_save_error", site=site, error=str(exc))
 
     async def close_context(self, site: str) -> None:
         """Close and remove the context for *site*."""
         async with self._lock:
             ctx = self._contexts.pop(site, None)
+            self._context_created.pop(site, None)
+            self._pages_served.pop(site, None)
             if ctx:
                 try:
                     await ctx.close()
                     log.debug("browser_pool.context_closed", site=site)
                 except Exception as exc:
                     log.warning("browser_pool.context_close_error", site=site, error=str(exc))
-        gc.collect()
 
     async def close_all(self) -> None:
         """Close all contexts, the browser, and stop Playwright."""
@@ -170,6 +224,8 @@ class BrowserPool:
                 except Exception:
                     pass
             self._contexts.clear()
+            self._context_created.clear()
+            self._pages_served.clear()
 
             if self._browser:
                 try:
@@ -193,6 +249,9 @@ class BrowserPool:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _count_page(self, site: str) -> None:
+        self._pages_served[site] = self._pages_served.get(site, 0) + 1
+
     async def _ensure_browser(self) -> None:
         """Start Playwright + launch Chromium if not already running."""
         if self._playwright is None:
@@ -217,42 +276,33 @@ class BrowserPool:
             )
             log.debug("browser_pool.browser_launched")
 
-    async def _load_cookies(self, site: str, context: Any) -> bool:
-        """Load cookies from disk into *context* if they are not expired.
+    def _fresh_state_path(self, site: str) -> Optional[Path]:
+        """Return the saved storage-state file for *site* if it is within COOKIE_TTL.
 
-        Returns True if cookies were loaded, False otherwise.
+        Expired state files are removed so the next save starts clean.
         """
-        cookies_file = BROWSER_PROFILES_DIR / site / "cookies.json"
-        if not cookies_file.exists():
-            return False
+        state_path = BROWSER_PROFILES_DIR / site / "state.json"
+        if not state_path.exists():
+            return None
 
         try:
-            payload = json.loads(cookies_file.read_text(encoding="utf-8"))
-            saved_at: float = payload.get("saved_at", 0.0)
-            cookies: list[dict] = payload.get("cookies", [])
-
             ttl_hours = COOKIE_TTL.get(site, 24)
-            ttl_seconds = ttl_hours * 3600
-            age_seconds = time.time() - saved_at
+            age_seconds = time.time() - state_path.stat().st_mtime
 
-            if age_seconds > ttl_seconds:
+            if age_seconds > ttl_hours * 3600:
                 log.debug(
-                    "browser_pool.cookies_expired",
+                    "browser_pool.state_expired",
                     site=site,
                     age_hours=round(age_seconds / 3600, 1),
                     ttl_hours=ttl_hours,
                 )
-                cookies_file.unlink(missing_ok=True)
-                return False
-
-            if cookies:
-                await context.add_cookies(cookies)
-                return True
-
-        except Exception as exc:
-            log.warning("browser_pool.cookies_load_error", site=site, error=str(exc))
+                state_path.unlink(missing_ok=True)
+                return None
+        except OSError as exc:
+            log.warning("browser_pool.state_load_error", site=site, error=str(exc))
+            return None
 
-        return False
+        return state_path
 
 
 # Module-level singleton
@@ -2,14 +2,27 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
+import functools
+import os
 from typing import Any, Optional
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import structlog
 
-from backend.scrapers.base import BaseScraper
-from backend.scrapers.browser_pool import browser_pool
+try:
+    from bs4 import BeautifulSoup
+    _BS4_AVAILABLE = True
+except ImportError:
+    _BS4_AVAILABLE = False
+
+try:
+    import lxml  # noqa: F401 — C-backed tree builder for bs4
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+from backend.scrapers.base import BaseScraper, get_http_client, synthetic_id
+from backend.scrapers.browser_pool import browser_pool, wait_for_idle
 
 log = structlog.get_logger(__name__)
 
@@ -24,6 +37,93 @@ FALLBACK_SELECTORS = [
     "article",
     "li[class]",
 ]
+FALLBACK_UNION = ", ".join(FALLBACK_SELECTORS)
+
+# Buckets one query over FALLBACK_UNION by originating selector and returns
+# [selector, count] for the first one that looks like a list of job cards
+# (at least three matches, a link among the first five), or null
+_PICK_FALLBACK_JS = """
+([union, selectors]) => {
+    const buckets = selectors.map(() => []);
+    for (const el of document.querySelectorAll(union)) {
+        selectors.forEach((s, i) => { if (el.matches(s)) buckets[i].push(el); });
+    }
+    for (let i = 0; i < selectors.length; i++) {
+        const els = buckets[i];
+        if (els.length >= 3 && els.slice(0, 5).some(el => el.querySelector("a") !== null)) {
+            return [selectors[i], els.length];
+        }
+    }
+    return null;
+}
+"""
+
+# How many career pages (each in its own browser context) are scraped at once
+CAREER_PAGE_CONCURRENCY = int(os.getenv("CAREER_PAGE_CONCURRENCY", "3"))
+
+# Tabs opened per source for detail-page enrichment
+DETAIL_PAGE_CONCURRENCY = 4
+
+# Main content blocks tried, in order, when reading a job detail page
+DETAIL_SELECTORS = [
+    "[class*='description']",
+    "[class*='content']",
+    "main",
+    "article",
+    ".job-detail",
+]
+
+# ATS hosts whose job pages are server-rendered — fetched with httpx, no browser needed
+_ATS_HOSTS = frozenset({
+    "boards.greenhouse.io",
+    "job-boards.greenhouse.io",
+    "jobs.lever.co",
+    "apply.workable.com",
+    "jobs.ashbyhq.com",
+    "jobs.smartrecruiters.com",
+})
+
+_HTTP_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    ),
+}
+
+# Per-card field selectors, shared by every source
+TITLE_SEL = "h1, h2, h3, h4, h5, [class*='title'], [class*='name']"
+LINK_SEL = "a[href]"
+LOC_SEL = "[class*='location'], [class*='place'], [class*='city'], [class*='lugar']"
+
+# Pulls title / link / location out of every matched card in a single round-trip,
+# instead of several query_selector + inner_text calls per element.  Returned as
+# parallel arrays (t, h, l) — a smaller payload than one object per card.
+_EXTRACT_JS = """
+({sel, titleSel, linkSel, locSel}) => {
+    const out = {t: [], h: [], l: []};
+    for (const el of document.querySelectorAll(sel)) {
+        const t = el.querySelector(titleSel);
+        const a = el.querySelector("a");
+        const link = el.querySelector(linkSel);
+        const l = el.querySelector(locSel);
+        const title = t ? t.innerText : (a ? a.innerText : (el.innerText || "").split("\\n")[0].slice(0, 120));
+        out.t.push((title || "").trim());
+        out.h.push(link ? (link.getAttribute("href") || "") : "");
+        out.l.push(l ? (l.innerText || "").trim() : "");
+    }
+    return out;
+}
+"""
+
+
+@functools.lru_cache(maxsize=4096)
+def _last_path_segment(url: str) -> str:
+    """Last non-empty path segment of *url* — usually the posting id or slug."""
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    return parts[-1] if parts else ""
 
 
 class CareerPageScraper(BaseScraper):
@@ -60,41 +160,40 @@ class CareerPageScraper(BaseScraper):
             self._log.info("career_page.no_sources_configured")
             return []
 
-        all_jobs: list[dict] = []
+        unique: dict[str, dict] = {}
+        sem = asyncio.Semaphore(CAREER_PAGE_CONCURRENCY)
 
-        for source in sources:
-            self._log.info(
-                "career_page.scraping_source",
-                company=source.company_name,
-                url=source.source_url,
-            )
-            try:
-                jobs = await self._scrape_source(source)
-                all_jobs.extend(jobs)
+        async def scrape_bounded(source: Any) -> list[dict]:
+            async with sem:
                 self._log.info(
-                    "career_page.source_done",
-                    company=source.company_name,
-                    found=len(jobs),
-                )
-            except Exception as exc:
-                self._log.warning(
-                    "career_page.source_error",
+                    "career_page.scraping_source",
                     company=source.company_name,
-                    error=str(exc),
+                    url=source.source_url,
                 )
-            await self._rate_limit()
+                try:
+                    jobs = await self._scrape_source(source)
+                    self._log.info(
+                        "career_page.source_done",
+                        company=source.company_name,
+                        found=len(jobs),
+                    )
+                except Exception as exc:
+                    self._log.warning(
+                        "career_page.source_error",
+                        company=source.company_name,
+                        error=str(exc),
+                    )
+                    jobs = []
+                await self._rate_limit()
+                return jobs
 
-        # Deduplicate
-        seen: set[str] = set()
-        unique: list[dict] = []
-        for job in all_jobs:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
+        # Each source has its own browser context, so they can run side by side
+        for jobs in await asyncio.gather(*(scrape_bounded(source) for source in sources)):
+            for job in jobs:
+                unique.setdefault(job["external_id"], job)
 
         self._log.info("career_page.total", total=len(unique))
-        return unique
+        return list(unique.values())
 
     # ------------------------------------------------------------------
     # Per-source scrape
@@ -107,9 +206,10 @@ class CareerPageScraper(BaseScraper):
         jobs: list[dict] = []
 
         try:
-            # Navigate to the career page and wait for it to settle
-            await page.goto(source.source_url, wait_until="networkidle", timeout=45_000)
-            await asyncio.sleep(2)
+            # Navigate to the career page and give it a bounded moment to settle
+            await page.goto(source.source_url, wait_until="domcontentloaded", timeout=20_000)
+            await wait_for_idle(page)
+            await asyncio.sleep(0.3)
 
             # Scroll to trigger lazy loading
             try:
@@ -119,10 +219,10 @@ class CareerPageScraper(BaseScraper):
             except Exception:
                 pass
 
-            # Find job elements
-            elements = await self._find_job_elements(page, source.css_selector)
+            # Find the selector that matches the job cards
+            selector = await self._find_job_elements(page, source.css_selector)
 
-            if not elements:
+            if not selector:
                 self._log.warning(
                     "career_page.no_elements_found",
                     company=source.company_name,
@@ -131,13 +231,13 @@ class CareerPageScraper(BaseScraper):
                 return []
 
             # Extract basic info from listing page
-            listing_jobs = await self._extract_from_elements(elements, source)
+            listing_jobs = await self._extract_from_elements(page, selector, source)
             jobs.extend(listing_jobs)
 
             # Optionally navigate to each job detail page for more info
             # (only if we have a reasonable number of jobs to avoid infinite scraping)
             if len(listing_jobs) <= 30:
-                detailed_jobs = await self._enrich_with_detail_pages(listing_jobs, source, page)
+                detailed_jobs = await self._enrich_with_detail_pages(listing_jobs, source, context)
                 jobs = detailed_jobs
             else:
                 jobs = listing_jobs
@@ -149,14 +249,12 @@ class CareerPageScraper(BaseScraper):
                 error=str(exc),
             )
         finally:
-            try:
-                await page.close()
-            except Exception:
-                pass
-            try:
-                await browser_pool.close_context(site_key)
-            except Exception:
-                pass
+            # Independent teardown steps — run together, errors ignored
+            await asyncio.gather(
+                page.close(),
+                browser_pool.close_context(site_key),
+                return_exceptions=True,
+            )
 
         return jobs
 
@@ -164,106 +262,77 @@ class CareerPageScraper(BaseScraper):
     # Element finding
     # ------------------------------------------------------------------
 
-    async def _find_job_elements(self, page: Any, css_selector: Optional[str]) -> list[Any]:
-        """Return a list of page elements representing job listings."""
+    async def _find_job_elements(self, page: Any, css_selector: Optional[str]) -> Optional[str]:
+        """Return the CSS selector matching the job listings, or None."""
         # Try configured selector first
         if css_selector:
             try:
-                elements = await page.query_selector_all(css_selector)
-                if elements:
-                    self._log.debug("career_page.selector_hit", selector=css_selector, count=len(elements))
-                    return elements
+                count = await page.eval_on_selector_all(css_selector, "els => els.length")
+                if count:
+                    self._log.debug("career_page.selector_hit", selector=css_selector, count=count)
+                    return css_selector
                 else:
                     self._log.debug("career_page.selector_empty", selector=css_selector)
             except Exception as exc:
                 self._log.debug("career_page.selector_error", selector=css_selector, error=str(exc))
 
-        # Try fallback selectors
-        for selector in FALLBACK_SELECTORS:
-            try:
-                elements = await page.query_selector_all(selector)
-                if len(elements) >= 3:
-                    # Sanity check: must look like job cards (have text, have links)
-                    sample = elements[:5]
-                    has_links = False
-                    for el in sample:
-                        link = await el.query_selector("a")
-                        if link:
-                            has_links = True
-                            break
-                    if has_links:
-                        self._log.debug("career_page.fallback_selector_hit", selector=selector, count=len(elements))
-                        return elements
-            except Exception:
-                continue
+        # Try fallback selectors — all of them in a single round-trip
+        try:
+            hit = await page.evaluate(_PICK_FALLBACK_JS, [FALLBACK_UNION, FALLBACK_SELECTORS])
+        except Exception as exc:
+            self._log.debug("career_page.fallback_selector_error", error=str(exc))
+            hit = None
+        if hit:
+            selector, count = hit
+            self._log.debug("career_page.fallback_selector_hit", selector=selector, count=count)
+            return selector
 
-        return []
+        return None
 
     # ------------------------------------------------------------------
     # Extraction
     # ------------------------------------------------------------------
 
-    async def _extract_from_elements(self, elements: list[Any], source: Any) -> list[dict]:
+    async def _extract_from_elements(self, page: Any, selector: str, source: Any) -> list[dict]:
         jobs: list[dict] = []
         base_url = source.source_url
 
-        for element in elements:
-            try:
-                # Title: inner text of heading or the element itself
-                title = ""
-                title_el = await element.query_selector("h1, h2, h3, h4, h5, [class*='title'], [class*='name']")
-                if title_el:
-                    title = (await title_el.inner_text()).strip()
-                else:
-                    # Try link text
-                    link_el = await element.query_selector("a")
-                    if link_el:
-                        title = (await link_el.inner_text()).strip()
-                    else:
-                        raw_text = (await element.inner_text()).strip()
-                        # Take first line as title
-                        title = raw_text.split("\n")[0][:120].strip()
-
-                if not title or len(title) < 4:
-                    continue
-
-                # URL: find first link
-                href = ""
-                link_el = await element.query_selector("a[href]")
-                if link_el:
-                    href = await link_el.get_attribute("href") or ""
-                    if href and not href.startswith("http"):
-                        href = urljoin(base_url, href)
-
-                # Location
-                location = "España"
-                loc_el = await element.query_selector(
-                    "[class*='location'], [class*='place'], [class*='city'], [class*='lugar']"
-                )
-                if loc_el:
-                    location = (await loc_el.inner_text()).strip() or "España"
+        try:
+            cols = await page.evaluate(
+                _EXTRACT_JS,
+                {"sel": selector, "titleSel": TITLE_SEL, "linkSel": LINK_SEL, "locSel": LOC_SEL},
+            )
+        except Exception as exc:
+            self._log.debug("career_page.element_extract_error", error=str(exc))
+            return jobs
 
-                external_id = self._extract_id_from_url(href) or self._synthetic_id(
-                    title, source.company_name
-                )
+        for title, href, location in zip(cols["t"], cols["h"], cols["l"]):
+            if not title or len(title) < 4:
+                continue
 
-                jobs.append({
-                    "site": self.SITE,
-                    "external_id": f"{source.company_name.lower().replace(' ', '_')}_{external_id}",
-                    "url": href or base_url,
-                    "title": title,
-                    "company": source.company_name,
-                    "location": location,
-                    "description": None,
-                    "salary_raw": None,
-                    "contract_type": None,
-                    "cv_profile": source.cv_profile,
-                    "raw_data": {"title": title, "url": href},
-                })
+            # URL: first link, resolved against the listing page
+            if href and not href.startswith("http"):
+                href = urljoin(base_url, href)
 
-            except Exception as exc:
-                self._log.debug("career_page.element_extract_error", error=str(exc))
-                continue
+            location = location or "España"
+
+            external_id = self._extract_id_from_url(href) or self._synthetic_id(
+                title, source.company_name
+            )
+
+            jobs.append({
+                "site": self.SITE,
+                "external_id": f"{source.company_name.lower().replace(' ', '_')}_{external_id}",
+                "url": href or base_url,
+                "title": title,
+                "company": source.company_name,
+                "location": location,
+                "description": None,
+                "salary_raw": None,
+                "contract_type": None,
+                "cv_profile": source.cv_profile,
+                "raw_data": {"title": title, "url": href},
+            })
 
         return jobs
 
@@ -272,30 +341,92 @@ class CareerPageScraper(BaseScraper):
     # ------------------------------------------------------------------
 
     async def _enrich_with_detail_pages(
-        self, jobs: list[dict], source: Any, page: Any
+        self, jobs: list[dict], source: Any, context: Any
     ) -> list[dict]:
-        """Visit each job URL to extract a richer description."""
-        enriched: list[dict] = []
-
+        """Visit each job URL to extract a richer description.
+
+        Pages hosted on a known ATS are fetched over plain HTTP; the rest are
+        loaded concurrently from a small pool of tabs in the source's browser
+        context.
+        """
+        ats_targets: list[dict] = []
+        browser_targets: list[dict] = []
         for job in jobs:
             url = job.get("url", "")
             if not url or url == source.source_url:
-                enriched.append(job)
                 continue
+            if urlparse(url).netloc.lower() in _ATS_HOSTS:
+                ats_targets.append(job)
+            else:
+                browser_targets.append(job)
+
+        if ats_targets:
+            await self._enrich_via_http(ats_targets)
+        if browser_targets:
+            await self._enrich_via_browser(browser_targets, context)
 
+        return jobs
+
+    async def _enrich_via_http(self, jobs: list[dict]) -> None:
+        if not _BS4_AVAILABLE:
+            self._log.warning("career_page.bs4_unavailable", tip="pip install beautifulsoup4")
+            return
+
+        sem = asyncio.Semaphore(DETAIL_PAGE_CONCURRENCY)
+        # Shared HTTP/2 client: detail pages on the same ATS host reuse its connections
+        client = get_http_client()
+
+        async def enrich(job: dict) -> None:
+            url = job["url"]
+            async with sem:
+                try:
+                    resp = await client.get(url, headers=_HTTP_HEADERS, timeout=20.0)
+                    if resp.status_code != 200:
+                        self._log.debug("career_page.detail_http_not_200", url=url, status=resp.status_code)
+                        return
+
+                    # Parsing is CPU-bound — keep it off the loop the other fetches share
+                    description = await asyncio.to_thread(self._parse_detail, resp.content)
+                    if description:
+                        job["description"] = description
+
+                    await self._rate_limit()
+
+                except Exception as exc:
+                    self._log.debug("career_page.detail_page_error", url=url, error=str(exc))
+
+        await asyncio.gather(*(enrich(job) for job in jobs))
+
+    @staticmethod
+    def _parse_detail(html: bytes) -> str:
+        """Text of the first DETAIL_SELECTORS block on a detail page, capped at 3000 chars."""
+        soup = BeautifulSoup(html, _HTML_PARSER)
+        for sel in DETAIL_SELECTORS:
+            content_el = soup.select_one(sel)
+            if content_el:
+                return content_el.get_text("\n", strip=True)[:3000]
+        return ""
+
+    async def _enrich_via_browser(self, jobs: list[dict], context: Any) -> None:
+        free_pages: asyncio.Queue = asyncio.Queue()
+        pages = [
+            await context.new_page()
+            for _ in range(min(DETAIL_PAGE_CONCURRENCY, len(jobs)))
+        ]
+        for p in pages:
+            free_pages.put_nowait(p)
+
+        async def enrich(job: dict) -> None:
+            url = job["url"]
+            page = await free_pages.get()
             try:
                 await page.goto(url, wait_until="domcontentloaded", timeout=20_000)
-                await asyncio.sleep(1)
+                await wait_for_idle(page)
+                await asyncio.sleep(0.3)
 
                 # Try to grab the main content block
                 description = ""
-                for sel in [
-                    "[class*='description']",
-                    "[class*='content']",
-                    "main",
-                    "article",
-                    ".job-detail",
-                ]:
+                for sel in DETAIL_SELECTORS:
                     content_el = await page.query_selector(sel)
                     if content_el:
                         description = (await content_el.inner_text()).strip()[:3000]
@@ -304,27 +435,28 @@ class CareerPageScraper(BaseScraper):
                 if description:
                     job["description"] = description
 
-                enriched.append(job)
                 await self._rate_limit()
 
             except Exception as exc:
                 self._log.debug("career_page.detail_page_error", url=url, error=str(exc))
-                enriched.append(job)
+            finally:
+                free_pages.put_nowait(page)
 
-        return enriched
+        try:
+            await asyncio.gather(*(enrich(job) for job in jobs))
+        finally:
+            for p in pages:
+                try:
+                    await p.close()
+                except Exception:
+                    pass
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
     def _extract_id_from_url(self, url: str) -> str:
-        if not url:
-            return ""
-        from urllib.parse import urlparse
-        path = urlparse(url).path
-        parts = [p for p in path.split("/") if p]
-        return parts[-1] if parts else ""
+        return _last_path_segment(url) if url else ""
 
     def _synthetic_id(self, title: str, company: str) -> str:
-        raw = f"{self.SITE}|{company.lower()}|{title.lower()}"
-        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+        return synthetic_id(self.SITE, company.lower(), title.lower())
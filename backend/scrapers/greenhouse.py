@@ -1,13 +1,15 @@
 """Greenhouse ATS platform scraper — pure httpx, no browser needed."""
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import functools
 from typing import Any, Optional
 
 import httpx
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+from backend.scrapers.base import BaseScraper, get_http_client, keyword_pattern
 
 log = structlog.get_logger(__name__)
 
@@ -16,6 +18,14 @@ SPAIN_KEYWORDS = [
     "híbrido", "hibrido", "valencia", "sevilla", "bilbao", "zaragoza",
 ]
 
+# Matched against lowercased text
+_SPAIN_RE = keyword_pattern(SPAIN_KEYWORDS)
+_FRONTEND_RE = keyword_pattern(["frontend", "front-end", "react", "vue", "angular", "css", "ui engineer"])
+_FULLSTACK_RE = keyword_pattern([
+    "fullstack", "full stack", "full-stack", "backend", "software engineer",
+    "developer", "python", "java", "node",
+])
+
 # Default company slugs and the CV profile they map to.
 # All are Spanish-based or have significant Spain presence.
 DEFAULT_COMPANIES: dict[str, str] = {
@@ -31,6 +41,20 @@ DEFAULT_COMPANIES: dict[str, str] = {
     "habitissimo": "fullstack_dev",
 }
 
+# Display names for slugs that don't survive str.capitalize()
+_KNOWN_COMPANY_NAMES: dict[str, str] = {
+    "cabify": "Cabify",
+    "glovo": "Glovo",
+    "wallapop": "Wallapop",
+    "travelperk": "TravelPerk",
+    "typeform": "Typeform",
+    "factorial": "Factorial",
+    "paack": "Paack",
+    "jobandtalent": "Job&Talent",
+    "letgo": "Letgo",
+    "habitissimo": "Habitissimo",
+}
+
 
 class GreenhouseScraper(BaseScraper):
     """Scrape Greenhouse ATS job boards for Spanish tech companies."""
@@ -70,31 +94,36 @@ class GreenhouseScraper(BaseScraper):
         except Exception as exc:
             self._log.warning("greenhouse.db_sources_error", error=str(exc))
 
-        all_jobs: list[dict] = []
+        unique: dict[str, dict] = {}
+        # Boards are independent — fetch them concurrently, a few at a time
+        sem = asyncio.Semaphore(5)
 
-        async with httpx.AsyncClient(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        ) as client:
-            for slug, cv_profile in companies.items():
+        # Shared HTTP/2 client: every board lives on the same API host, so one
+        # multiplexed connection serves all slugs
+        client = get_http_client()
+
+        async def fetch_bounded(slug: str, cv_profile: str) -> list[dict]:
+            async with sem:
                 self._log.info("greenhouse.fetching", slug=slug)
                 jobs = await self._fetch_company(client, slug, cv_profile)
-                all_jobs.extend(jobs)
                 self._log.info("greenhouse.company_done", slug=slug, found=len(jobs))
                 await self._rate_limit()
+                return jobs
+
+        results = await asyncio.gather(
+            *(fetch_bounded(slug, cv_profile) for slug, cv_profile in companies.items()),
+            return_exceptions=True,
+        )
 
-        # Deduplicate
-        seen: set[str] = set()
-        unique: list[dict] = []
-        for job in all_jobs:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
+        for slug, result in zip(companies, results):
+            if isinstance(result, BaseException):
+                self._log.warning("greenhouse.fetch_error", slug=slug, error=str(result))
+                continue
+            for job in result:
+                unique.setdefault(job["external_id"], job)
 
         self._log.info("greenhouse.total", total=len(unique))
-        return unique
+        return list(unique.values())
 
     # ------------------------------------------------------------------
     # Per-company fetch
@@ -105,12 +134,11 @@ class GreenhouseScraper(BaseScraper):
     ) -> list[dict]:
         url = self.API_BASE.format(slug=slug)
         try:
-            resp = await client.get(url, timeout=20.0)
+            resp = await client.get(url, headers=self.HEADERS, timeout=20.0)
             if resp.status_code == 404:
                 self._log.debug("greenhouse.company_not_found", slug=slug)
                 return []
             resp.raise_for_status()
-            data = resp.json()
         except httpx.HTTPStatusError as exc:
             self._log.warning(
                 "greenhouse.http_error",
@@ -123,6 +151,17 @@ class GreenhouseScraper(BaseScraper):
             self._log.warning("greenhouse.fetch_error", slug=slug, error=str(exc))
             return []
 
+        try:
+            # Decoding, location filtering and profile classification are CPU-bound
+            # on large boards — keep them off the loop the other fetches share
+            return await asyncio.to_thread(self._parse_board, resp.content, slug, cv_profile)
+        except Exception as exc:
+            self._log.warning("greenhouse.parse_error", slug=slug, error=str(exc))
+            return []
+
+    def _parse_board(self, content: bytes, slug: str, cv_profile: str) -> list[dict]:
+        """Decode a board payload and normalise its Spain/remote jobs."""
+        data = orjson.loads(content)
         jobs_raw = data.get("jobs") if isinstance(data, dict) else (data if isinstance(data, list) else [])
         result: list[dict] = []
         for raw in jobs_raw:
@@ -172,7 +211,7 @@ class GreenhouseScraper(BaseScraper):
             "salary_raw": None,
             "contract_type": None,
             "cv_profile": refined_profile,
-            "raw_data": raw,
+            "raw_data": raw if self.STORE_RAW else None,
         }
 
     # ------------------------------------------------------------------
@@ -181,28 +220,18 @@ class GreenhouseScraper(BaseScraper):
 
     def _is_spain_or_remote(self, location: str) -> bool:
         loc = location.lower()
-        return any(kw in loc for kw in SPAIN_KEYWORDS) or not loc
+        return not loc or _SPAIN_RE.search(loc) is not None
 
-    def _slug_to_company_name(self, slug: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _slug_to_company_name(slug: str) -> str:
         """Convert slug like 'travelperk' → 'TravelPerk'."""
-        known = {
-            "cabify": "Cabify",
-            "glovo": "Glovo",
-            "wallapop": "Wallapop",
-            "travelperk": "TravelPerk",
-            "typeform": "Typeform",
-            "factorial": "Factorial",
-            "paack": "Paack",
-            "jobandtalent": "Job&Talent",
-            "letgo": "Letgo",
-            "habitissimo": "Habitissimo",
-        }
-        return known.get(slug, slug.capitalize())
+        return _KNOWN_COMPANY_NAMES.get(slug) or slug.capitalize()
 
     def _assign_cv_profile(self, title: str, default: str) -> str:
         t = title.lower()
-        if any(kw in t for kw in ["frontend", "front-end", "react", "vue", "angular", "css", "ui engineer"]):
+        if _FRONTEND_RE.search(t):
             return "frontend_dev"
-        if any(kw in t for kw in ["fullstack", "full stack", "full-stack", "backend", "software engineer", "developer", "python", "java", "node"]):
+        if _FULLSTACK_RE.search(t):
             return "fullstack_dev"
         return default
@@ -2,19 +2,31 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import gc
 import re
 from typing import Any, Optional
 from urllib.parse import quote_plus
 
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+from backend.scrapers.base import BaseScraper, classify, keyword_pattern
 from backend.scrapers.browser_pool import browser_pool
 
 log = structlog.get_logger(__name__)
 
 
+_PROFILE_RULES: list[tuple[re.Pattern[str], str]] = [
+    # Tech roles
+    (keyword_pattern(["react", "frontend", "front-end", "front end", "javascript", "typescript", "vue", "angular"]), "frontend_dev"),
+    (keyword_pattern(["fullstack", "full stack", "full-stack", "node", "backend", "python", "java", "golang"]), "fullstack_dev"),
+    # Retail cashier
+    (keyword_pattern(["cajero", "cajera", "dependiente", "dependienta", "caja", "atención al cliente"]), "cashier"),
+    # Stocker / warehouse
+    (keyword_pattern(["reponedor", "reponedora", "almacén", "almacen", "stock", "operario", "mozo"]), "stocker"),
+]
+
+
 class IndeedESScraper(BaseScraper):
     """Scrape Indeed.es by intercepting the internal job-search API traffic."""
 
@@ -31,6 +43,8 @@ class IndeedESScraper(BaseScraper):
     ]
     LOCATION = "España"
     BASE_URL = "https://es.indeed.com"
+    # Everything in the search URL except the query and offset, encoded once
+    _SEARCH_URL = BASE_URL + "/jobs?q={q}&l=" + quote_plus(LOCATION) + "&start={start}&sort=date"
 
     def __init__(self, db_session_factory: Any) -> None:
         super().__init__(self.SITE, db_session_factory)
@@ -50,6 +64,9 @@ class IndeedESScraper(BaseScraper):
                 jobs = await self._search_query(page, query)
                 all_jobs.extend(jobs)
                 self._log.info("indeed_es.query_done", query=query, count=len(jobs))
+                # Reclaim the query's intercepted payloads (route closures, response
+                # dicts) between queries rather than at an arbitrary point mid-page
+                gc.collect()
                 await self._rate_limit()
 
             await browser_pool.save_cookies(self.SITE, context)
@@ -57,11 +74,12 @@ class IndeedESScraper(BaseScraper):
         except Exception as exc:
             self._log.exception("indeed_es.scrape_error", error=str(exc))
         finally:
-            try:
-                await page.close()
-            except Exception:
-                pass
-            await browser_pool.close_context(self.SITE)
+            # Independent teardown steps — run together, errors ignored
+            await asyncio.gather(
+                page.close(),
+                browser_pool.close_context(self.SITE),
+                return_exceptions=True,
+            )
 
         self._log.info("indeed_es.total", total=len(all_jobs))
         return all_jobs
@@ -76,16 +94,14 @@ class IndeedESScraper(BaseScraper):
         cursor: Optional[str] = None
         page_num = 0
         max_pages = 5
+        # Set by handle_route whenever an intercepted response yields jobs
+        new_jobs = asyncio.Event()
 
         async def handle_route(route: Any, request: Any) -> None:
             try:
                 response = await route.fetch()
                 body = await response.body()
-                try:
-                    data = json.loads(body)
-                    self._extract_jobs_from_response(data, captured_jobs)
-                except (json.JSONDecodeError, ValueError):
-                    pass
+                # Hand the response back to the page before parsing it
                 await route.fulfill(response=response)
             except Exception as exc:
                 self._log.debug("indeed_es.route_error", error=str(exc))
@@ -93,28 +109,39 @@ class IndeedESScraper(BaseScraper):
                     await route.continue_()
                 except Exception:
                     pass
+                return
+
+            try:
+                data = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                return
+            before = len(captured_jobs)
+            self._extract_jobs_from_response(data, captured_jobs)
+            if len(captured_jobs) > before:
+                new_jobs.set()
 
         await page.route("**/api/vsearch/l**", handle_route)
         await page.route("**/rpc/jobsearch**", handle_route)
         await page.route("**/jobs/search**", handle_route)
 
+        q = quote_plus(query)
         while page_num < max_pages:
-            url = self._build_search_url(query, self.LOCATION, start=page_num * 10)
+            url = self._build_search_url(q, start=page_num * 10)
+            new_jobs.clear()
             try:
-                await page.goto(url, wait_until="networkidle", timeout=30_000)
-                await asyncio.sleep(2)
+                await page.goto(url, wait_until="domcontentloaded", timeout=20_000)
             except Exception as exc:
                 self._log.warning("indeed_es.navigation_error", url=url, error=str(exc))
                 break
 
-            # If no new jobs captured this page, stop paginating
-            before = len(captured_jobs)
-            await asyncio.sleep(1)
-            after = len(captured_jobs)
-
-            if after == before and page_num > 0:
-                self._log.debug("indeed_es.no_new_jobs_on_page", page=page_num)
-                break
+            # Wait for the page's job-search call to land; if none brings new
+            # jobs, stop paginating
+            try:
+                await asyncio.wait_for(new_jobs.wait(), timeout=3)
+            except asyncio.TimeoutError:
+                if page_num > 0:
+                    self._log.debug("indeed_es.no_new_jobs_on_page", page=page_num)
+                    break
 
             page_num += 1
             await self._rate_limit()
@@ -132,6 +159,8 @@ class IndeedESScraper(BaseScraper):
                 seen.add(job["external_id"])
                 result.append(job)
 
+        # The raw payloads aren't needed past normalisation — release them before the next query
+        captured_jobs.clear()
         return result
 
     # ------------------------------------------------------------------
@@ -140,24 +169,21 @@ class IndeedESScraper(BaseScraper):
 
     def _extract_jobs_from_response(self, data: Any, out: list[dict]) -> None:
         """Try multiple known Indeed API response shapes."""
-        # Shape 1: {"jobResults": [{"job": {...}}]}
         if isinstance(data, dict):
-            for item in data.get("jobResults", []):
-                job_node = item.get("job") or item
-                if isinstance(job_node, dict):
-                    out.append(job_node)
+            get = data.get
+            # Shape 1: {"jobResults": [{"job": {...}}]}
+            out.extend(
+                node
+                for node in ((it.get("job") or it) for it in get("jobResults") or () if isinstance(it, dict))
+                if isinstance(node, dict)
+            )
 
             # Shape 2: {"results": [...]}
-            for item in data.get("results", []):
-                if isinstance(item, dict):
-                    out.append(item)
+            out.extend(it for it in get("results") or () if isinstance(it, dict))
 
             # Shape 3: {"metaData": {"jobResultsPayload": {"results": [...]}}}
-            meta = data.get("metaData", {})
-            payload = meta.get("jobResultsPayload", {})
-            for item in payload.get("results", []):
-                if isinstance(item, dict):
-                    out.append(item)
+            payload = (get("metaData") or {}).get("jobResultsPayload") or {}
+            out.extend(it for it in payload.get("results") or () if isinstance(it, dict))
 
         elif isinstance(data, list):
             out.extend(item for item in data if isinstance(item, dict))
@@ -228,38 +254,20 @@ class IndeedESScraper(BaseScraper):
             "salary_raw": salary_raw,
             "contract_type": raw.get("contractType") or raw.get("jobType"),
             "cv_profile": cv_profile,
-            "raw_data": raw,
+            "raw_data": raw if self.STORE_RAW else None,
         }
 
     # ------------------------------------------------------------------
     # URL builder
     # ------------------------------------------------------------------
 
-    def _build_search_url(self, query: str, location: str, start: int = 0) -> str:
-        q = quote_plus(query)
-        loc = quote_plus(location)
-        return f"{self.BASE_URL}/jobs?q={q}&l={loc}&start={start}&sort=date"
+    def _build_search_url(self, q: str, start: int = 0) -> str:
+        """Build a search page URL from an already ``quote_plus``-encoded query."""
+        return self._SEARCH_URL.format(q=q, start=start)
 
     # ------------------------------------------------------------------
     # CV profile assignment
     # ------------------------------------------------------------------
 
     def _assign_cv_profile(self, title: str) -> str:
-        t = title.lower()
-
-        # Tech roles
-        if any(kw in t for kw in ["react", "frontend", "front-end", "front end", "javascript", "typescript", "vue", "angular"]):
-            return "frontend_dev"
-        if any(kw in t for kw in ["fullstack", "full stack", "full-stack", "node", "backend", "python", "java", "golang"]):
-            return "fullstack_dev"
-
-        # Retail cashier
-        if any(kw in t for kw in ["cajero", "cajera", "dependiente", "dependienta", "caja", "atención al cliente"]):
-            return "cashier"
-
-        # Stocker / warehouse
-        if any(kw in t for kw in ["reponedor", "reponedora", "almacén", "almacen", "stock", "operario", "mozo"]):
-            return "stocker"
-
-        # Default
-        return "logistics"
+        return classify(title.lower(), _PROFILE_RULES, "logistics")
@@ -2,17 +2,53 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import re
 from typing import Any, Optional
 from urllib.parse import quote_plus
 
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+from backend.scrapers.base import BaseScraper, JobRecord, classify, keyword_pattern
 from backend.scrapers.browser_pool import browser_pool
 
 log = structlog.get_logger(__name__)
 
+_PROFILE_RULES: list[tuple[re.Pattern[str], str]] = [
+    (keyword_pattern(["react", "frontend", "front-end", "front end", "javascript", "typescript", "vue", "angular"]), "frontend_dev"),
+    (keyword_pattern(["fullstack", "full stack", "full-stack", "node", "backend", "python"]), "fullstack_dev"),
+    (keyword_pattern(["cajero", "cajera", "dependiente", "dependienta", "caja"]), "cashier"),
+    (keyword_pattern(["reponedor", "reponedora", "almacén", "almacen", "stock", "mozo"]), "stocker"),
+]
+
+# Reads every offer card on a results page in a single evaluate call
+_DOM_HARVEST_JS = """
+() => Array.from(
+    document.querySelectorAll('[class*="ij-OfferCard"], [data-offer-id], .offer-item')
+).map(card => {
+    const text = (sel) => {
+        const el = card.querySelector(sel);
+        return el ? (el.innerText || "").trim() : "";
+    };
+    const link = card.querySelector("a[href]");
+    return {
+        id: card.getAttribute("data-offer-id") || "",
+        title: text('[class*="title"], h2, h3'),
+        company: text('[class*="company"], [class*="employer"]'),
+        location: text('[class*="location"], [class*="place"]'),
+        href: link ? (link.getAttribute("href") || "") : "",
+    };
+})
+"""
+
+# InfoJobs internal API endpoints whose JSON responses carry offers
+_API_ROUTES = (
+    "**/api/*/oferta/**",
+    "**/candidates-api/**",
+    "**/api/*/offer/**",
+    "**/jobad-search/**",
+)
+
 # Optional keyring for stored login credentials
 try:
     import keyring as _keyring
@@ -36,22 +72,32 @@ class InfoJobsScraper(BaseScraper):
         "react developer",
     ]
     BASE_URL = "https://www.infojobs.net"
+    # Static part of the results URL; only the keyword and page vary
+    _SEARCH_PREFIX = BASE_URL + "/jobsearch/searchResults/list.xhtml?provinceIds=0&sortBy=PUBLICATION_DATE&keyword="
 
     def __init__(self, db_session_factory: Any) -> None:
         super().__init__(self.SITE, db_session_factory)
+        # Per-query capture state written by the page-wide route handler.
+        # Raw offers are keyed by their InfoJobs id — the same offer shows up
+        # in several intercepted responses, so it is only kept once
+        self._captured_by_id: dict[str, dict] = {}
+        # Set whenever an intercepted response yields new offers
+        self._new_jobs = asyncio.Event()
 
     # ------------------------------------------------------------------
     # Main scrape
     # ------------------------------------------------------------------
 
-    async def scrape(self) -> list[dict]:
+    async def scrape(self) -> list[JobRecord]:
         context = await browser_pool.get_context(self.SITE)
         page = await context.new_page()
-        all_jobs: list[dict] = []
+        all_jobs: list[JobRecord] = []
 
         try:
             # Attempt login if credentials available
             await self._maybe_login(page)
+            # Routes live for the whole page; each query swaps in fresh state
+            await self._install_routes(page)
 
             for query in self.SEARCH_QUERIES:
                 self._log.info("infojobs.searching", query=query)
@@ -116,18 +162,20 @@ class InfoJobsScraper(BaseScraper):
     # Per-query search
     # ------------------------------------------------------------------
 
-    async def _search_query(self, page: Any, query: str) -> list[dict]:
-        captured_jobs: list[dict] = []
-        max_pages = 5
-
+    async def _install_routes(self, page: Any) -> None:
+        """Intercept the offer APIs once; the page's teardown drops the routes."""
         async def handle_route(route: Any, request: Any) -> None:
             try:
                 response = await route.fetch()
                 body = await response.body()
                 try:
-                    data = json.loads(body)
-                    self._extract_jobs_from_response(data, captured_jobs)
-                except (json.JSONDecodeError, ValueError):
+                    data = orjson.loads(body)
+                    captured = self._captured_by_id
+                    before = len(captured)
+                    self._extract_jobs_from_response(data, captured)
+                    if len(captured) > before:
+                        self._new_jobs.set()
+                except orjson.JSONDecodeError:
                     pass
                 await route.fulfill(response=response)
             except Exception as exc:
@@ -137,47 +185,46 @@ class InfoJobsScraper(BaseScraper):
                 except Exception:
                     pass
 
-        # Intercept InfoJobs internal API endpoints
-        await page.route("**/api/*/oferta/**", handle_route)
-        await page.route("**/candidates-api/**", handle_route)
-        await page.route("**/api/*/offer/**", handle_route)
-        await page.route("**/jobad-search/**", handle_route)
+        for pattern in _API_ROUTES:
+            await page.route(pattern, handle_route)
 
-        result: list[dict] = []
-        seen: set[str] = set()
+    async def _search_query(self, page: Any, query: str) -> list[JobRecord]:
+        captured_by_id: dict[str, dict] = {}
+        self._captured_by_id = captured_by_id
+        new_jobs = self._new_jobs
+        max_pages = 5
 
+        q = quote_plus(query)
         for page_num in range(1, max_pages + 1):
-            url = self._build_search_url(query, page_num)
+            url = self._build_search_url(q, page_num)
+            new_jobs.clear()
             try:
-                await page.goto(url, wait_until="networkidle", timeout=30_000)
-                await asyncio.sleep(2)
+                await page.goto(url, wait_until="domcontentloaded", timeout=15_000)
             except Exception as exc:
                 self._log.warning("infojobs.navigation_error", url=url, error=str(exc))
                 break
 
-            before = len(captured_jobs)
-            await asyncio.sleep(1.5)
-            after = len(captured_jobs)
-
-            if after == before and page_num > 1:
-                self._log.debug("infojobs.no_new_jobs", page=page_num)
-                break
+            # Wait for the page's search calls to land instead of sleeping a
+            # fixed interval; if none brings new offers, stop paginating
+            try:
+                await asyncio.wait_for(new_jobs.wait(), timeout=5)
+                # Let the rest of the response burst settle
+                await asyncio.sleep(0.3)
+            except asyncio.TimeoutError:
+                if page_num > 1:
+                    self._log.debug("infojobs.no_new_jobs", page=page_num)
+                    break
 
             await self._rate_limit()
 
         # Also try to extract from DOM as fallback
-        dom_jobs = await self._extract_from_dom(page)
-        captured_jobs.extend(dom_jobs)
+        for raw in await self._extract_from_dom(page):
+            self._add_offer(raw, captured_by_id)
 
-        await page.unroute("**/api/*/oferta/**")
-        await page.unroute("**/candidates-api/**")
-        await page.unroute("**/api/*/offer/**")
-        await page.unroute("**/jobad-search/**")
-
-        for raw in captured_jobs:
+        result: list[JobRecord] = []
+        for raw in captured_by_id.values():
             job = self._normalise_job(raw)
-            if job and job["external_id"] not in seen:
-                seen.add(job["external_id"])
+            if job:
                 result.append(job)
 
         return result
@@ -188,66 +235,61 @@ class InfoJobsScraper(BaseScraper):
 
     async def _extract_from_dom(self, page: Any) -> list[dict]:
         """Extract job cards from the DOM as a fallback."""
-        jobs: list[dict] = []
         try:
-            cards = await page.query_selector_all('[class*="ij-OfferCard"], [data-offer-id], .offer-item')
-            for card in cards:
-                try:
-                    title_el = await card.query_selector('[class*="title"], h2, h3')
-                    company_el = await card.query_selector('[class*="company"], [class*="employer"]')
-                    location_el = await card.query_selector('[class*="location"], [class*="place"]')
-                    link_el = await card.query_selector("a[href]")
-
-                    title = await title_el.inner_text() if title_el else ""
-                    company = await company_el.inner_text() if company_el else ""
-                    location = await location_el.inner_text() if location_el else ""
-                    href = await link_el.get_attribute("href") if link_el else ""
-
-                    offer_id = await card.get_attribute("data-offer-id") or ""
-
-                    if title or offer_id:
-                        jobs.append({
-                            "id": offer_id or href,
-                            "title": title.strip(),
-                            "company": {"name": company.strip()},
-                            "location": {"label": location.strip()},
-                            "detailUrl": (self.BASE_URL + href) if href and not href.startswith("http") else href,
-                        })
-                except Exception:
-                    pass
+            # One round-trip for every card instead of several per card
+            cards = await page.evaluate(_DOM_HARVEST_JS)
         except Exception as exc:
             self._log.debug("infojobs.dom_extract_error", error=str(exc))
+            return []
+
+        jobs: list[dict] = []
+        for card in cards:
+            title, offer_id, href = card["title"], card["id"], card["href"]
+            if title or offer_id:
+                jobs.append({
+                    "id": offer_id or href,
+                    "title": title,
+                    "company": {"name": card["company"]},
+                    "location": {"label": card["location"]},
+                    "detailUrl": (self.BASE_URL + href) if href and not href.startswith("http") else href,
+                })
         return jobs
 
     # ------------------------------------------------------------------
     # Response extraction
     # ------------------------------------------------------------------
 
-    def _extract_jobs_from_response(self, data: Any, out: list[dict]) -> None:
+    def _extract_jobs_from_response(self, data: Any, out: dict[str, dict]) -> None:
         if isinstance(data, dict):
-            # Shape: {"items": [...]}
-            for item in data.get("items", []):
-                if isinstance(item, dict):
-                    out.append(item)
-            # Shape: {"offerList": [...]}
-            for item in data.get("offerList", []):
-                if isinstance(item, dict):
-                    out.append(item)
-            # Shape: {"offers": [...]}
-            for item in data.get("offers", []):
-                if isinstance(item, dict):
-                    out.append(item)
+            # Shapes: {"items": [...]}, {"offerList": [...]}, {"offers": [...]} —
+            # a response carries one of them
+            for key in ("items", "offerList", "offers"):
+                items = data.get(key)
+                if items:
+                    for item in items:
+                        self._add_offer(item, out)
+                    break
             # Shape direct offer
             if "id" in data and "title" in data:
-                out.append(data)
+                self._add_offer(data, out)
         elif isinstance(data, list):
-            out.extend(item for item in data if isinstance(item, dict))
+            for item in data:
+                self._add_offer(item, out)
+
+    @staticmethod
+    def _add_offer(item: Any, out: dict[str, dict]) -> None:
+        """Keep the first raw offer seen per id; id-less offers can't be normalised."""
+        if not isinstance(item, dict):
+            return
+        rid = str(item.get("id") or item.get("offerId") or item.get("jobId") or "")
+        if rid and rid not in out:
+            out[rid] = item
 
     # ------------------------------------------------------------------
     # Normalisation
     # ------------------------------------------------------------------
 
-    def _normalise_job(self, raw: dict) -> Optional[dict]:
+    def _normalise_job(self, raw: dict) -> Optional[JobRecord]:
         external_id = str(raw.get("id") or raw.get("offerId") or raw.get("jobId") or "")
         if not external_id:
             return None
@@ -287,40 +329,31 @@ class InfoJobsScraper(BaseScraper):
 
         cv_profile = self._assign_cv_profile(title)
 
-        return {
-            "site": self.SITE,
-            "external_id": external_id,
-            "url": url,
-            "title": title,
-            "company": company,
-            "location": location,
-            "description": raw.get("description") or raw.get("snippet") or "",
-            "salary_raw": salary_raw,
-            "contract_type": contract_type,
-            "cv_profile": cv_profile,
-            "raw_data": raw,
-        }
+        return JobRecord(
+            site=self.SITE,
+            external_id=external_id,
+            url=url,
+            title=title,
+            company=company,
+            location=location,
+            description=raw.get("description") or raw.get("snippet") or "",
+            salary_raw=salary_raw,
+            contract_type=contract_type,
+            cv_profile=cv_profile,
+            raw_data=raw if self.STORE_RAW else None,
+        )
 
     # ------------------------------------------------------------------
     # URL builder
     # ------------------------------------------------------------------
 
-    def _build_search_url(self, query: str, page: int = 1) -> str:
-        q = quote_plus(query)
-        return f"{self.BASE_URL}/jobsearch/searchResults/list.xhtml?keyword={q}&provinceIds=0&sortBy=PUBLICATION_DATE&page={page}"
+    def _build_search_url(self, q: str, page: int = 1) -> str:
+        """Build a results page URL from an already ``quote_plus``-encoded query."""
+        return f"{self._SEARCH_PREFIX}{q}&page={page}"
 
     # ------------------------------------------------------------------
     # CV profile assignment
     # ------------------------------------------------------------------
 
     def _assign_cv_profile(self, title: str) -> str:
-        t = title.lower()
-        if any(kw in t for kw in ["react", "frontend", "front-end", "front end", "javascript", "typescript", "vue", "angular"]):
-            return "frontend_dev"
-        if any(kw in t for kw in ["fullstack", "full stack", "full-stack", "node", "backend", "python"]):
-            return "fullstack_dev"
-        if any(kw in t for kw in ["cajero", "cajera", "dependiente", "dependienta", "caja"]):
-            return "cashier"
-        if any(kw in t for kw in ["reponedor", "reponedora", "almacén", "almacen", "stock", "mozo"]):
-            return "stocker"
-        return "logistics"
+        return classify(title.lower(), _PROFILE_RULES, "logistics")
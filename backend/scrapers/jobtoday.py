@@ -1,16 +1,31 @@
 """JobToday Tier 1 scraper — httpx JSON API."""
 from __future__ import annotations
 
-import hashlib
+import re
 from typing import Any, Optional
 
 import httpx
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+from backend.scrapers.base import (
+    BaseScraper,
+    JobRecord,
+    classify,
+    first_value,
+    get_http_client,
+    keyword_pattern,
+    synthetic_id,
+)
 
 log = structlog.get_logger(__name__)
 
+_PROFILE_RULES: list[tuple[re.Pattern[str], str]] = [
+    (keyword_pattern(["cajero", "cajera", "caja", "dependiente", "dependienta", "cashier"]), "cashier"),
+    (keyword_pattern(["reponedor", "almacén", "almacen", "stock", "mozo", "operario", "warehouse"]), "stocker"),
+    (keyword_pattern(["repartidor", "delivery", "conductor", "logística", "logistica", "mensajero"]), "logistics"),
+]
+
 
 class JobTodayScraper(BaseScraper):
     """Scrape JobToday public API for retail and logistics jobs in Spain."""
@@ -38,39 +53,27 @@ class JobTodayScraper(BaseScraper):
     # Main scrape
     # ------------------------------------------------------------------
 
-    async def scrape(self) -> list[dict]:
-        all_jobs: list[dict] = []
-
-        async with httpx.AsyncClient(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        ) as client:
-            for category in self.CATEGORIES:
-                self._log.info("jobtoday.fetching_category", category=category)
-                jobs = await self._fetch_category(client, category)
-                all_jobs.extend(jobs)
-                self._log.info("jobtoday.category_done", category=category, count=len(jobs))
-                await self._rate_limit()
-
-        # Deduplicate by external_id
-        seen: set[str] = set()
-        unique: list[dict] = []
-        for job in all_jobs:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
+    async def scrape(self) -> list[JobRecord]:
+        unique: dict[str, JobRecord] = {}
+
+        client = get_http_client()
+        for category in self.CATEGORIES:
+            self._log.info("jobtoday.fetching_category", category=category)
+            jobs = await self._fetch_category(client, category)
+            for job in jobs:
+                unique.setdefault(job.external_id, job)
+            self._log.info("jobtoday.category_done", category=category, count=len(jobs))
+            await self._rate_limit()
 
         self._log.info("jobtoday.total", total=len(unique))
-        return unique
+        return list(unique.values())
 
     # ------------------------------------------------------------------
     # Per-category fetch with pagination
     # ------------------------------------------------------------------
 
-    async def _fetch_category(self, client: httpx.AsyncClient, category: str) -> list[dict]:
-        jobs: list[dict] = []
+    async def _fetch_category(self, client: httpx.AsyncClient, category: str) -> list[JobRecord]:
+        jobs: list[JobRecord] = []
         offset = 0
         max_pages = 10
 
@@ -84,9 +87,9 @@ class JobTodayScraper(BaseScraper):
             }
 
             try:
-                response = await client.get(self.API_BASE, params=params)
+                response = await client.get(self.API_BASE, params=params, headers=self.HEADERS)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
             except httpx.HTTPStatusError as exc:
                 self._log.warning(
                     "jobtoday.http_error",
@@ -118,77 +121,68 @@ class JobTodayScraper(BaseScraper):
     # Extraction + normalisation
     # ------------------------------------------------------------------
 
-    def _extract_jobs(self, data: Any) -> list[dict]:
+    def _extract_jobs(self, data: Any) -> list[JobRecord]:
         raw_list: list[dict] = []
 
         if isinstance(data, dict):
-            raw_list = (
-                data.get("jobs")
-                or data.get("results")
-                or data.get("data")
-                or data.get("items")
-                or []
-            )
+            raw_list = first_value(data, ("jobs", "results", "data", "items"), [])
         elif isinstance(data, list):
             raw_list = data
 
-        result: list[dict] = []
+        result: list[JobRecord] = []
         for raw in raw_list:
             job = self._normalise_job(raw)
             if job:
                 result.append(job)
         return result
 
-    def _normalise_job(self, raw: dict) -> Optional[dict]:
-        external_id = (
-            str(raw.get("id") or raw.get("jobId") or raw.get("_id") or "")
-        )
+    def _normalise_job(self, raw: dict) -> Optional[JobRecord]:
+        external_id = str(first_value(raw, ("id", "jobId", "_id")))
         if not external_id:
             external_id = self._synthetic_id(raw)
 
-        title = raw.get("title") or raw.get("jobTitle") or raw.get("position") or ""
-        company = (
-            raw.get("company")
-            or raw.get("companyName")
-            or raw.get("employer", {}).get("name", "")
-            or "N/A"
-        )
+        title = first_value(raw, ("title", "jobTitle", "position"))
+
+        company = first_value(raw, ("company", "companyName"), None)
+        if not company:
+            employer = raw.get("employer")
+            company = employer.get("name") if isinstance(employer, dict) else None
         if isinstance(company, dict):
-            company = company.get("name") or company.get("label") or "N/A"
+            company = first_value(company, ("name", "label"), None)
+        company = company or "N/A"
 
-        location = (
-            raw.get("location")
-            or raw.get("city")
-            or raw.get("address", {}).get("city", "")
-            or "España"
-        )
+        location = first_value(raw, ("location", "city"), None)
+        if not location:
+            address = raw.get("address")
+            location = address.get("city") if isinstance(address, dict) else None
         if isinstance(location, dict):
-            location = location.get("city") or location.get("label") or "España"
+            location = first_value(location, ("city", "label"), None)
+        location = location or "España"
 
-        description = raw.get("description") or raw.get("snippet") or ""
-        salary_raw = raw.get("salary") or raw.get("salaryText") or None
+        description = first_value(raw, ("description", "snippet"))
+        salary_raw = first_value(raw, ("salary", "salaryText"), None)
         if isinstance(salary_raw, dict):
-            salary_raw = salary_raw.get("text") or salary_raw.get("description")
+            salary_raw = first_value(salary_raw, ("text", "description"), None)
 
-        url = raw.get("url") or raw.get("link") or raw.get("jobUrl") or ""
+        url = first_value(raw, ("url", "link", "jobUrl"))
         if not url and external_id:
             url = f"https://jobtoday.com/jobs/{external_id}"
 
-        contract_type = raw.get("contractType") or raw.get("jobType") or None
-
-        return {
-            "site": self.SITE,
-            "external_id": external_id,
-            "url": url,
-            "title": title,
-            "company": company,
-            "location": location,
-            "description": description,
-            "salary_raw": str(salary_raw) if salary_raw else None,
-            "contract_type": contract_type,
-            "cv_profile": self._assign_cv_profile(title),
-            "raw_data": raw,
-        }
+        contract_type = first_value(raw, ("contractType", "jobType"), None)
+
+        return JobRecord(
+            site=self.SITE,
+            external_id=external_id,
+            url=url,
+            title=title,
+            company=company,
+            location=location,
+            description=description,
+            salary_raw=str(salary_raw) if salary_raw else None,
+            contract_type=contract_type,
+            cv_profile=self._assign_cv_profile(title),
+            raw_data=raw if self.STORE_RAW else None,
+        )
 
     # ------------------------------------------------------------------
     # Helpers
@@ -198,15 +192,7 @@ class JobTodayScraper(BaseScraper):
         title = raw.get("title", "")
         company = raw.get("company", "") if isinstance(raw.get("company"), str) else ""
         location = raw.get("location", "") if isinstance(raw.get("location"), str) else ""
-        raw_str = f"{self.SITE}|{title.lower()}|{company.lower()}|{location.lower()}"
-        return hashlib.sha256(raw_str.encode()).hexdigest()[:32]
+        return synthetic_id(self.SITE, title.lower(), company.lower(), location.lower())
 
     def _assign_cv_profile(self, title: str) -> str:
-        t = title.lower()
-        if any(kw in t for kw in ["cajero", "cajera", "caja", "dependiente", "dependienta", "cashier"]):
-            return "cashier"
-        if any(kw in t for kw in ["reponedor", "almacén", "almacen", "stock", "mozo", "operario", "warehouse"]):
-            return "stocker"
-        if any(kw in t for kw in ["repartidor", "delivery", "conductor", "logística", "logistica", "mensajero"]):
-            return "logistics"
-        return "logistics"
+        return classify(title.lower(), _PROFILE_RULES, "logistics")
@@ -1,13 +1,17 @@
 """Lever ATS platform scraper — pure httpx."""
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import re
+import time
 from typing import Any, Optional
 
 import httpx
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+from backend.scrapers.base import BaseScraper, JobRecord, classify, get_http_client, keyword_pattern
 
 log = structlog.get_logger(__name__)
 
@@ -17,6 +21,17 @@ SPAIN_KEYWORDS = [
     "anywhere", "worldwide",
 ]
 
+# Matched against the lowercased location
+_SPAIN_RE = keyword_pattern(SPAIN_KEYWORDS)
+
+_PROFILE_RULES: list[tuple[re.Pattern[str], str]] = [
+    (keyword_pattern(["frontend", "front-end", "react", "vue", "angular", "ui engineer"]), "frontend_dev"),
+    (keyword_pattern([
+        "fullstack", "full stack", "full-stack", "backend", "software engineer",
+        "developer", "python", "java", "node", "sre", "devops",
+    ]), "fullstack_dev"),
+]
+
 # Spanish tech companies using Lever ATS
 DEFAULT_COMPANIES: dict[str, str] = {
     "cabify": "fullstack_dev",
@@ -31,6 +46,27 @@ DEFAULT_COMPANIES: dict[str, str] = {
     "lastminute-com": "fullstack_dev",
 }
 
+# Display names for slugs that don't survive the dash-to-space title-casing
+_SLUG_TO_NAME: dict[str, str] = {
+    "cabify": "Cabify",
+    "schibsted-spain": "Schibsted Spain",
+    "idealista": "Idealista",
+    "flywire": "Flywire",
+    "privalia": "Privalia",
+    "ulabox": "Ulabox",
+    "bcneng": "BCN Engineering",
+    "fever": "Fever",
+    "adevinta": "Adevinta",
+    "lastminute-com": "Lastminute.com",
+}
+
+_DASH_TO_SPACE = str.maketrans("-", " ")
+
+# DB-configured Lever slugs, reused across runs for _SOURCES_TTL seconds so a
+# frequent schedule doesn't query company_sources every time
+_SOURCES_TTL = 300.0
+_SOURCES_CACHE: Optional[tuple[float, dict[str, str]]] = None
+
 
 class LeverScraper(BaseScraper):
     """Scrape Lever ATS job boards for Spanish tech companies."""
@@ -55,10 +91,50 @@ class LeverScraper(BaseScraper):
     # Main scrape
     # ------------------------------------------------------------------
 
-    async def scrape(self) -> list[dict]:
+    async def scrape(self) -> list[JobRecord]:
         companies = dict(DEFAULT_COMPANIES)
 
         # Merge with DB-configured sources
+        companies.update(await self._db_companies())
+
+        unique: dict[str, JobRecord] = {}
+        # Companies are independent — fetch them concurrently, a few at a time
+        sem = asyncio.Semaphore(8)
+
+        # Shared HTTP/2 client: the per-company GETs multiplex over one connection
+        client = get_http_client()
+
+        async def fetch_bounded(company_slug: str, cv_profile: str) -> list[JobRecord]:
+            async with sem:
+                self._log.info("lever.fetching", company=company_slug)
+                jobs = await self._fetch_company(client, company_slug, cv_profile)
+                self._log.info("lever.company_done", company=company_slug, found=len(jobs))
+                await self._rate_limit()
+                return jobs
+
+        results = await asyncio.gather(
+            *(fetch_bounded(slug, cv_profile) for slug, cv_profile in companies.items()),
+            return_exceptions=True,
+        )
+
+        for company_slug, result in zip(companies, results):
+            if isinstance(result, BaseException):
+                self._log.warning("lever.fetch_error", company=company_slug, error=str(result))
+                continue
+            for job in result:
+                unique.setdefault(job.external_id, job)
+
+        self._log.info("lever.total", total=len(unique))
+        return list(unique.values())
+
+    async def _db_companies(self) -> dict[str, str]:
+        """Lever slugs → cv_profile from company_sources, cached for _SOURCES_TTL."""
+        global _SOURCES_CACHE
+        now = time.monotonic()
+        if _SOURCES_CACHE is not None and now - _SOURCES_CACHE[0] < _SOURCES_TTL:
+            return _SOURCES_CACHE[1]
+
+        companies: dict[str, str] = {}
         try:
             async with self.db_session_factory() as db:
                 from backend.database.crud import list_company_sources
@@ -70,32 +146,11 @@ class LeverScraper(BaseScraper):
                         companies[slug] = source.cv_profile
         except Exception as exc:
             self._log.warning("lever.db_sources_error", error=str(exc))
+            # Fall back to the last good lookup rather than dropping DB sources
+            return _SOURCES_CACHE[1] if _SOURCES_CACHE is not None else {}
 
-        all_jobs: list[dict] = []
-
-        async with httpx.AsyncClient(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        ) as client:
-            for company_slug, cv_profile in companies.items():
-                self._log.info("lever.fetching", company=company_slug)
-                jobs = await self._fetch_company(client, company_slug, cv_profile)
-                all_jobs.extend(jobs)
-                self._log.info("lever.company_done", company=company_slug, found=len(jobs))
-                await self._rate_limit()
-
-        # Deduplicate
-        seen: set[str] = set()
-        unique: list[dict] = []
-        for job in all_jobs:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
-
-        self._log.info("lever.total", total=len(unique))
-        return unique
+        _SOURCES_CACHE = (now, companies)
+        return companies
 
     # ------------------------------------------------------------------
     # Per-company fetch
@@ -103,15 +158,15 @@ class LeverScraper(BaseScraper):
 
     async def _fetch_company(
         self, client: httpx.AsyncClient, company: str, cv_profile: str
-    ) -> list[dict]:
+    ) -> list[JobRecord]:
         url = self.API_BASE.format(company=company)
         try:
-            resp = await client.get(url, timeout=20.0)
+            resp = await client.get(url, headers=self.HEADERS, timeout=20.0)
             if resp.status_code == 404:
                 self._log.debug("lever.company_not_found", company=company)
                 return []
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
         except httpx.HTTPStatusError as exc:
             self._log.warning(
                 "lever.http_error",
@@ -127,9 +182,13 @@ class LeverScraper(BaseScraper):
         if not isinstance(data, list):
             data = data.get("jobs") or data.get("postings") or [] if isinstance(data, dict) else []
 
-        result: list[dict] = []
+        # Slug-level, so resolved once rather than per posting
+        company_name = self._slug_to_company_name(company)
+
+        result: list[JobRecord] = []
         for raw in data:
-            if not isinstance(raw, dict):
+            # Postings without an id are dropped anyway — skip them before filtering
+            if not isinstance(raw, dict) or not raw.get("id"):
                 continue
             # Filter for Spain/Remote
             categories = raw.get("categories") or {}
@@ -145,7 +204,7 @@ class LeverScraper(BaseScraper):
             if location and not self._is_spain_or_remote(location):
                 continue
 
-            job = self._normalise_job(raw, company, cv_profile, location)
+            job = self._normalise_job(raw, company, company_name, cv_profile, location)
             if job:
                 result.append(job)
 
@@ -156,14 +215,14 @@ class LeverScraper(BaseScraper):
     # ------------------------------------------------------------------
 
     def _normalise_job(
-        self, raw: dict, company: str, cv_profile: str, location: str
-    ) -> Optional[dict]:
+        self, raw: dict, company: str, company_name: str, cv_profile: str, location: str
+    ) -> Optional[JobRecord]:
         external_id = str(raw.get("id") or "")
         if not external_id:
             return None
 
         title = raw.get("text") or raw.get("title") or ""
-        company_name = raw.get("company") or self._slug_to_company_name(company)
+        company_name = raw.get("company") or company_name
 
         url = raw.get("hostedUrl") or raw.get("applyUrl") or f"https://jobs.lever.co/{company}/{external_id}"
 
@@ -182,19 +241,19 @@ class LeverScraper(BaseScraper):
 
         refined_profile = self._assign_cv_profile(title, cv_profile)
 
-        return {
-            "site": self.SITE,
-            "external_id": f"{company}_{external_id}",
-            "url": url,
-            "title": title,
-            "company": company_name,
-            "location": location or "España",
-            "description": description,
-            "salary_raw": None,
-            "contract_type": raw.get("workplaceType") or team or None,
-            "cv_profile": refined_profile,
-            "raw_data": raw,
-        }
+        return JobRecord(
+            site=self.SITE,
+            external_id=f"{company}_{external_id}",
+            url=url,
+            title=title,
+            company=company_name,
+            location=location or "España",
+            description=description,
+            salary_raw=None,
+            contract_type=raw.get("workplaceType") or team or None,
+            cv_profile=refined_profile,
+            raw_data=raw if self.STORE_RAW else None,
+        )
 
     # ------------------------------------------------------------------
     # Helpers
@@ -202,27 +261,12 @@ class LeverScraper(BaseScraper):
 
     def _is_spain_or_remote(self, location: str) -> bool:
         loc = location.lower()
-        return any(kw in loc for kw in SPAIN_KEYWORDS) or not loc
-
-    def _slug_to_company_name(self, slug: str) -> str:
-        known = {
-            "cabify": "Cabify",
-            "schibsted-spain": "Schibsted Spain",
-            "idealista": "Idealista",
-            "flywire": "Flywire",
-            "privalia": "Privalia",
-            "ulabox": "Ulabox",
-            "bcneng": "BCN Engineering",
-            "fever": "Fever",
-            "adevinta": "Adevinta",
-            "lastminute-com": "Lastminute.com",
-        }
-        return known.get(slug, slug.replace("-", " ").title())
+        return not loc or _SPAIN_RE.search(loc) is not None
+
+    @staticmethod
+    def _slug_to_company_name(slug: str) -> str:
+        """Convert slug like 'schibsted-spain' → 'Schibsted Spain'."""
+        return _SLUG_TO_NAME.get(slug) or slug.translate(_DASH_TO_SPACE).title()
 
     def _assign_cv_profile(self, title: str, default: str) -> str:
-        t = title.lower()
-        if any(kw in t for kw in ["frontend", "front-end", "react", "vue", "angular", "ui engineer"]):
-            return "frontend_dev"
-        if any(kw in t for kw in ["fullstack", "full stack", "full-stack", "backend", "software engineer", "developer", "python", "java", "node", "sre", "devops"]):
-            return "fullstack_dev"
-        return default
+        return classify(title.lower(), _PROFILE_RULES, default)
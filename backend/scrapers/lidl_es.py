@@ -1,7 +1,7 @@
 """Lidl España Tier 1 scraper — httpx + BeautifulSoup."""
 from __future__ import annotations
 
-import hashlib
+import asyncio
 import re
 from typing import Any, Optional
 from urllib.parse import urljoin, urlparse
@@ -15,16 +15,59 @@ try:
 except ImportError:
     _BS4_AVAILABLE = False
 
-from backend.scrapers.base import BaseScraper
+try:
+    import lxml  # noqa: F401 — C-backed tree builder for bs4
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+from backend.scrapers.base import (
+    BaseScraper,
+    JobRecord,
+    cached_result,
+    conditional_headers,
+    classify,
+    fold,
+    get_http_client,
+    keyword_pattern,
+    remember_result,
+    synthetic_id,
+)
 
 log = structlog.get_logger(__name__)
 
 RELEVANT_KEYWORDS = [
-    "tienda", "almacén", "almacen", "logística", "logistica",
+    "tienda", "almacen", "logistica",
     "cajero", "cajera", "reponedor", "reponedora", "operario",
     "operaria", "dependiente", "dependienta", "comercial",
 ]
 
+# Matched against the folded title (see base.fold), so keywords are unaccented
+_RELEVANT_RE = keyword_pattern(RELEVANT_KEYWORDS)
+
+# Lidl typically uses a list of job cards; selectors in priority order
+CARD_SELECTORS = [
+    "article.job-item",
+    ".vacancy-item",
+    ".job-listing__item",
+    "[class*='job-item']",
+    "[class*='vacancy']",
+    "li[class*='job']",
+]
+CARD_UNION = ", ".join(CARD_SELECTORS)
+
+# Card field class patterns, and the hrefs that look like job postings
+_TITLE_CLASS_RE = re.compile("title|position|job-name", re.I)
+_LOCATION_CLASS_RE = re.compile("location|place|city", re.I)
+_CONTRACT_CLASS_RE = re.compile("contract|type|jornada", re.I)
+_JOB_HREF_RE = re.compile(r"/vacancies/|/job/|/jobs/")
+
+_PROFILE_RULES: list[tuple[re.Pattern[str], str]] = [
+    (keyword_pattern(["cajero", "cajera", "caja", "dependiente", "dependienta"]), "cashier"),
+    (keyword_pattern(["reponedor", "reponedora", "almacen", "stock", "operario", "mozo"]), "stocker"),
+    (keyword_pattern(["logistica", "transporte", "reparto"]), "logistics"),
+]
+
 
 class LidlESScraper(BaseScraper):
     """Scrape Lidl España career portal."""
@@ -52,90 +95,114 @@ class LidlESScraper(BaseScraper):
     # Main scrape
     # ------------------------------------------------------------------
 
-    async def scrape(self) -> list[dict]:
-        all_jobs: list[dict] = []
-
-        async with httpx.AsyncClient(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        ) as client:
-            page_num = 1
-            max_pages = 10
-
-            while page_num <= max_pages:
+    async def scrape(self) -> list[JobRecord]:
+        all_jobs: list[JobRecord] = []
+
+        # Shared HTTP/2 client: successive pages reuse one warm connection
+        client = get_http_client()
+        max_pages = 10
+        # Pages are independent — fetch them concurrently, a few at a time
+        sem = asyncio.Semaphore(5)
+        # Set once a page fails or comes back empty; pages not yet requested are skipped
+        exhausted = asyncio.Event()
+
+        async def fetch_page(page_num: int) -> list[JobRecord]:
+            async with sem:
+                if exhausted.is_set():
+                    return []
                 url = self._build_url(page_num)
                 self._log.info("lidl_es.fetching_page", url=url)
 
+                # Taken before the request, so concurrent pages share the rate
+                await self._rate_limit()
                 try:
-                    response = await client.get(url)
-                    response.raise_for_status()
+                    response = await client.get(url, headers=conditional_headers(url, self.HEADERS))
+                    if response.status_code != 304:
+                        response.raise_for_status()
                 except httpx.HTTPError as exc:
                     self._log.warning("lidl_es.http_error", url=url, error=str(exc))
-                    break
+                    exhausted.set()
+                    return []
 
-                jobs_on_page = self._parse_page(response.text)
+                if response.status_code == 304:
+                    jobs_on_page = cached_result(url)
+                else:
+                    # Parsing is CPU-bound — keep it off the loop so the other
+                    # pages' fetches proceed meanwhile
+                    jobs_on_page = await asyncio.to_thread(self._parse_page, response.content)
+                    remember_result(url, response, jobs_on_page)
 
                 if not jobs_on_page:
                     self._log.info("lidl_es.no_more_jobs", page=page_num)
-                    break
+                    exhausted.set()
+                    return []
 
-                all_jobs.extend(jobs_on_page)
                 self._log.info("lidl_es.page_done", page=page_num, found=len(jobs_on_page))
-                page_num += 1
-                await self._rate_limit()
+                return jobs_on_page
+
+        # Page 1 tells us whether there is anything to paginate
+        first_page = await fetch_page(1)
+        all_jobs.extend(first_page)
+        if first_page:
+            for jobs_on_page in await asyncio.gather(
+                *(fetch_page(page_num) for page_num in range(2, max_pages + 1))
+            ):
+                all_jobs.extend(jobs_on_page)
 
-        # Deduplicate
-        seen: set[str] = set()
-        unique: list[dict] = []
+        # Deduplicate — keyed by external_id, first occurrence wins
+        unique: dict[str, JobRecord] = {}
         for job in all_jobs:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
+            unique.setdefault(job.external_id, job)
 
         self._log.info("lidl_es.total", total=len(unique))
-        return unique
+        return list(unique.values())
 
     # ------------------------------------------------------------------
     # Parsing
     # ------------------------------------------------------------------
 
-    def _parse_page(self, html: str) -> list[dict]:
-        """Parse job listing cards from HTML."""
-        soup = BeautifulSoup(html, "html.parser")
-        jobs: list[dict] = []
-
-        # Lidl typically uses a list of job cards
-        selectors = [
-            "article.job-item",
-            ".vacancy-item",
-            ".job-listing__item",
-            "[class*='job-item']",
-            "[class*='vacancy']",
-            "li[class*='job']",
-        ]
+    def _parse_page(self, html: bytes) -> list[JobRecord]:
+        """Parse job listing cards from raw HTML bytes (the parser sniffs the encoding)."""
+        soup = BeautifulSoup(html, _HTML_PARSER)
+        jobs: list[JobRecord] = []
 
+        # One tree walk collects every candidate; the first selector, in
+        # priority order, that matches any of them decides which are cards
+        candidates = soup.select(CARD_UNION)
         cards = []
-        for selector in selectors:
-            cards = soup.select(selector)
+        for selector in CARD_SELECTORS:
+            cards = [el for el in candidates if el.css.match(selector)]
             if cards:
                 break
 
         # Fallback: look for any link that looks like a job posting
         if not cards:
-            cards = soup.find_all("a", href=re.compile(r"/vacancies/|/job/|/jobs/"))
+            cards = soup.find_all("a", href=_JOB_HREF_RE)
 
         for card in cards:
             job = self._parse_card(card)
-            if job and self._is_relevant(job.get("title", "")):
+            if job:
                 jobs.append(job)
 
         return jobs
 
-    def _parse_card(self, card: Any) -> Optional[dict]:
+    def _parse_card(self, card: Any) -> Optional[JobRecord]:
         """Extract job data from a single card element."""
         try:
+            # Title
+            title_el = card.find(["h2", "h3", "h4", "[class*='title']"])
+            if not title_el:
+                title_el = card.find(class_=_TITLE_CLASS_RE)
+            title = title_el.get_text(strip=True) if title_el else card.get_text(strip=True)[:100]
+
+            # Most cards on the vacancies page are for roles we don't apply to —
+            # drop them before the remaining tree searches
+            if not title:
+                return None
+            relevant, cv_profile = self._classify(fold(title))
+            if not relevant:
+                return None
+
             # Try to get the link
             link_el = card if card.name == "a" else card.find("a", href=True)
             href = ""
@@ -144,39 +211,30 @@ class LidlESScraper(BaseScraper):
                 if not href.startswith("http"):
                     href = urljoin(self.BASE_URL, href)
 
-            # Title
-            title_el = card.find(["h2", "h3", "h4", "[class*='title']"])
-            if not title_el:
-                title_el = card.find(class_=re.compile("title|position|job-name", re.I))
-            title = title_el.get_text(strip=True) if title_el else card.get_text(strip=True)[:100]
-
             # Location
-            location_el = card.find(class_=re.compile("location|place|city", re.I))
+            location_el = card.find(class_=_LOCATION_CLASS_RE)
             location = location_el.get_text(strip=True) if location_el else "España"
 
             # Contract type
-            contract_el = card.find(class_=re.compile("contract|type|jornada", re.I))
+            contract_el = card.find(class_=_CONTRACT_CLASS_RE)
             contract_type = contract_el.get_text(strip=True) if contract_el else None
 
             # External ID from URL slug
             external_id = self._extract_id_from_url(href) or self._synthetic_id(title, location)
 
-            if not title:
-                return None
-
-            return {
-                "site": self.SITE,
-                "external_id": external_id,
-                "url": href or self.BASE_URL,
-                "title": title,
-                "company": "Lidl España",
-                "location": location,
-                "description": None,
-                "salary_raw": None,
-                "contract_type": contract_type,
-                "cv_profile": self._assign_cv_profile(title),
-                "raw_data": {"href": href, "title": title},
-            }
+            return JobRecord(
+                site=self.SITE,
+                external_id=external_id,
+                url=href or self.BASE_URL,
+                title=title,
+                company="Lidl España",
+                location=location,
+                description=None,
+                salary_raw=None,
+                contract_type=contract_type,
+                cv_profile=cv_profile,
+                raw_data={"href": href, "title": title},
+            )
         except Exception as exc:
             self._log.debug("lidl_es.card_parse_error", error=str(exc))
             return None
@@ -190,10 +248,6 @@ class LidlESScraper(BaseScraper):
             return f"{self.VACANCIES_URL}?country=ES"
         return f"{self.VACANCIES_URL}?country=ES&page={page}"
 
-    def _is_relevant(self, title: str) -> bool:
-        t = title.lower()
-        return any(kw in t for kw in RELEVANT_KEYWORDS)
-
     def _extract_id_from_url(self, url: str) -> str:
         if not url:
             return ""
@@ -203,15 +257,10 @@ class LidlESScraper(BaseScraper):
         return parts[-1] if parts else ""
 
     def _synthetic_id(self, title: str, location: str) -> str:
-        raw = f"{self.SITE}|{title.lower()}|{location.lower()}"
-        return hashlib.sha256(raw.encode()).hexdigest()[:32]
-
-    def _assign_cv_profile(self, title: str) -> str:
-        t = title.lower()
-        if any(kw in t for kw in ["cajero", "cajera", "caja", "dependiente", "dependienta"]):
-            return "cashier"
-        if any(kw in t for kw in ["reponedor", "reponedora", "almacén", "almacen", "stock", "operario", "mozo"]):
-            return "stocker"
-        if any(kw in t for kw in ["logística", "logistica", "transporte", "reparto"]):
-            return "logistics"
-        return "stocker"
+        return synthetic_id(self.SITE, title.lower(), location.lower())
+
+    def _classify(self, t: str) -> tuple[bool, str]:
+        """Return ``(is_relevant, cv_profile)`` for an already-folded title."""
+        if _RELEVANT_RE.search(t) is None:
+            return False, "stocker"
+        return True, classify(t, _PROFILE_RULES, "stocker")
@@ -3,18 +3,40 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import json
+import re
+from collections import deque
 from typing import Any, Optional
 from urllib.parse import urljoin
 
 import httpx
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+from backend.scrapers.base import (
+    BaseScraper,
+    JobRecord,
+    cached_result,
+    conditional_headers,
+    first_value,
+    fold,
+    get_http_client,
+    keyword_pattern,
+    remember_result,
+)
 
 log = structlog.get_logger(__name__)
 
-SPAIN_KEYWORDS = ["spain", "españa", "madrid", "barcelona", "remote", "remoto", "híbrido", "hibrido"]
+SPAIN_KEYWORDS = ["spain", "espana", "madrid", "barcelona", "remote", "remoto", "hibrido"]
+
+# Matched against folded text (see base.fold), so keywords are unaccented
+_SPAIN_RE = keyword_pattern(SPAIN_KEYWORDS)
+_FRONTEND_RE = keyword_pattern(["frontend", "front-end", "react", "vue", "angular", "css", "html"])
+
+# Keys under which Next.js page props carry the offer list
+_OFFER_LIST_KEYS = ("offers", "jobs", "positions", "listings")
+
+# Next.js embeds the page props as JSON in this script tag
+_NEXT_DATA_RE = re.compile(rb'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
 
 
 class ManfredScraper(BaseScraper):
@@ -41,6 +63,7 @@ class ManfredScraper(BaseScraper):
         "fullstack", "full stack", "full-stack", "node", "python", "backend", "developer",
         "desarrollador", "programador", "software", "engineer",
     ]
+    _TECH_RE = keyword_pattern(TECH_KEYWORDS)
 
     def __init__(self, db_session_factory: Any) -> None:
         super().__init__(self.SITE, db_session_factory)
@@ -49,98 +72,100 @@ class ManfredScraper(BaseScraper):
     # Main scrape
     # ------------------------------------------------------------------
 
-    async def scrape(self) -> list[dict]:
-        all_jobs: list[dict] = []
+    async def scrape(self) -> list[JobRecord]:
+        # Shared HTTP/2 client: both strategies and every page reuse one connection
+        client = get_http_client()
 
         # Try the public API first
-        api_jobs = await self._fetch_via_api()
-        if api_jobs:
-            all_jobs.extend(api_jobs)
-            self._log.info("manfred.api_success", count=len(api_jobs))
+        jobs = await self._fetch_via_api(client)
+        if jobs:
+            self._log.info("manfred.api_success", count=len(jobs))
         else:
             # Fall back to browser/HTML scrape
             self._log.info("manfred.falling_back_to_html")
-            html_jobs = await self._fetch_via_html()
-            all_jobs.extend(html_jobs)
-
-        # Filter for Spain/Remote + tech roles
-        filtered = [j for j in all_jobs if self._is_relevant(j)]
+            jobs = await self._fetch_via_html(client)
 
-        # Deduplicate
-        seen: set[str] = set()
-        unique: list[dict] = []
-        for job in filtered:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
+        # Filter for Spain/Remote + tech roles and deduplicate in one pass —
+        # keyed by external_id, first occurrence wins; repeats skip the filter
+        unique: dict[str, JobRecord] = {}
+        for job in jobs:
+            if job.external_id not in unique and self._is_relevant(job):
+                unique[job.external_id] = job
 
         self._log.info("manfred.total", total=len(unique))
-        return unique
+        return list(unique.values())
 
     # ------------------------------------------------------------------
     # Strategy 1: JSON API
     # ------------------------------------------------------------------
 
-    async def _fetch_via_api(self) -> list[dict]:
-        jobs: list[dict] = []
-
-        async with httpx.AsyncClient(headers=self.HEADERS, follow_redirects=True, timeout=30.0) as client:
-            page = 1
-            max_pages = 20
-            page_size = 20
-
-            while page <= max_pages:
-                params: dict[str, Any] = {
-                    "page": page,
-                    "limit": page_size,
-                    "status": "active",
-                }
-                try:
-                    resp = await client.get(self.API_BASE, params=params)
-                    if resp.status_code == 404:
-                        self._log.debug("manfred.api_404")
-                        return []
-                    resp.raise_for_status()
-                    data = resp.json()
-                except httpx.HTTPStatusError as exc:
-                    if exc.response.status_code in (404, 405, 422):
-                        return []
-                    self._log.warning("manfred.api_error", error=str(exc))
-                    return jobs
-                except Exception as exc:
-                    self._log.warning("manfred.api_exception", error=str(exc))
-                    return jobs
-
-                page_jobs = self._parse_api_response(data)
-                if not page_jobs:
-                    break
-
-                jobs.extend(page_jobs)
-                page += 1
-
+    async def _fetch_via_api(self, client: httpx.AsyncClient) -> list[JobRecord]:
+        max_pages = 20
+        page_size = 20
+        # Pages are independent — fetch them concurrently, a few at a time
+        sem = asyncio.Semaphore(5)
+        # Set once a page comes back short or fails; pages not yet requested are skipped
+        exhausted = asyncio.Event()
+
+        async def fetch_page(page: int) -> Optional[list[JobRecord]]:
+            """Jobs on one page; None when the endpoint doesn't serve offers at all."""
+            url = f"{self.API_BASE}?page={page}&limit={page_size}&status=active"
+            # Taken before the request, so concurrent pages share the rate
+            await self._rate_limit()
+            try:
+                resp = await client.get(url, headers=conditional_headers(url, self.HEADERS))
+                if resp.status_code == 304:
+                    return cached_result(url)
+                if resp.status_code == 404:
+                    self._log.debug("manfred.api_404")
+                    return None
+                resp.raise_for_status()
+                data = orjson.loads(resp.content)
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code in (404, 405, 422):
+                    return None
+                self._log.warning("manfred.api_error", error=str(exc))
+                return []
+            except Exception as exc:
+                self._log.warning("manfred.api_exception", error=str(exc))
+                return []
+
+            page_jobs = self._parse_api_response(data)
+            remember_result(url, resp, page_jobs)
+            return page_jobs
+
+        async def fetch_bounded(page: int) -> list[JobRecord]:
+            async with sem:
+                if exhausted.is_set():
+                    return []
+                page_jobs = await fetch_page(page) or []
                 if len(page_jobs) < page_size:
-                    break
+                    exhausted.set()
+                return page_jobs
 
-                await self._rate_limit()
+        # Page 1 decides whether the API works and whether there is more to fetch
+        first_page = await fetch_page(1)
+        if not first_page:
+            return []
+        # Copied: the page list may be the cached result of an earlier run
+        jobs = list(first_page)
+        if len(jobs) == page_size:
+            for page_jobs in await asyncio.gather(
+                *(fetch_bounded(page) for page in range(2, max_pages + 1))
+            ):
+                jobs.extend(page_jobs)
 
         return jobs
 
-    def _parse_api_response(self, data: Any) -> list[dict]:
+    def _parse_api_response(self, data: Any) -> list[JobRecord]:
         raw_list: list[dict] = []
 
         if isinstance(data, dict):
-            raw_list = (
-                data.get("offers")
-                or data.get("jobs")
-                or data.get("data")
-                or data.get("results")
-                or []
-            )
+            raw_list = first_value(data, ("offers", "jobs", "data", "results"), [])
         elif isinstance(data, list):
             raw_list = data
 
-        result: list[dict] = []
+        result: list[JobRecord] = []
         for raw in raw_list:
             if not isinstance(raw, dict):
                 continue
@@ -149,13 +174,13 @@ class ManfredScraper(BaseScraper):
                 result.append(job)
         return result
 
-    def _normalise_api_job(self, raw: dict) -> Optional[dict]:
-        external_id = str(raw.get("id") or raw.get("slug") or raw.get("_id") or "")
+    def _normalise_api_job(self, raw: dict) -> Optional[JobRecord]:
+        external_id = str(first_value(raw, ("id", "slug", "_id")))
         if not external_id:
             return None
 
-        title = raw.get("position") or raw.get("title") or raw.get("jobTitle") or ""
-        company_node = raw.get("company") or {}
+        title = first_value(raw, ("position", "title", "jobTitle"))
+        company_node = raw.get("company")
         company = (
             company_node.get("name") if isinstance(company_node, dict) else company_node
         ) or raw.get("companyName") or "N/A"
@@ -178,87 +203,88 @@ class ManfredScraper(BaseScraper):
 
         cv_profile = self._assign_cv_profile(title)
 
-        return {
-            "site": self.SITE,
-            "external_id": external_id,
-            "url": url,
-            "title": title,
-            "company": company,
-            "location": location,
-            "description": description,
-            "salary_raw": salary_raw,
-            "contract_type": raw.get("contractType") or raw.get("contract"),
-            "cv_profile": cv_profile,
-            "raw_data": raw,
-        }
+        return JobRecord(
+            site=self.SITE,
+            external_id=external_id,
+            url=url,
+            title=title,
+            company=company,
+            location=location,
+            description=description,
+            salary_raw=salary_raw,
+            contract_type=raw.get("contractType") or raw.get("contract"),
+            cv_profile=cv_profile,
+            raw_data=raw if self.STORE_RAW else None,
+        )
 
     def _extract_location(self, raw: dict) -> str:
         locations = raw.get("locations") or []
         if isinstance(locations, list) and locations:
             loc = locations[0]
             if isinstance(loc, dict):
-                return loc.get("label") or loc.get("city") or loc.get("name") or "España"
+                return first_value(loc, ("label", "city", "name"), "España")
             return str(loc)
-        return (
-            raw.get("location")
-            or raw.get("city")
-            or raw.get("locationLabel")
-            or "España"
-        )
+        return first_value(raw, ("location", "city", "locationLabel"), "España")
 
     # ------------------------------------------------------------------
     # Strategy 2: HTML scrape with browser intercept
     # ------------------------------------------------------------------
 
-    async def _fetch_via_html(self) -> list[dict]:
+    async def _fetch_via_html(self, client: httpx.AsyncClient) -> list[JobRecord]:
         """Fetch Manfred offers page and parse HTML/JSON from embedded data."""
-        jobs: list[dict] = []
-
-        async with httpx.AsyncClient(headers=self.HEADERS, follow_redirects=True, timeout=30.0) as client:
-            try:
-                resp = await client.get(self.JOBS_PAGE)
-                resp.raise_for_status()
-                html = resp.text
-
-                # Try to find embedded JSON (Next.js __NEXT_DATA__ pattern)
-                import re
-                match = re.search(r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', html, re.DOTALL)
-                if match:
-                    next_data = json.loads(match.group(1))
-                    offers = self._dig_next_data(next_data)
-                    for raw in offers:
-                        job = self._normalise_api_job(raw)
-                        if job:
-                            jobs.append(job)
-                else:
-                    self._log.debug("manfred.no_next_data_found")
+        jobs: list[JobRecord] = []
+
+        try:
+            resp = await client.get(self.JOBS_PAGE, headers=self.HEADERS)
+            resp.raise_for_status()
+            # Searched as bytes: the blob goes straight to orjson, so the page
+            # never needs decoding to str
+            match = _NEXT_DATA_RE.search(resp.content)
+            if match:
+                # Decoding the page props and digging through them is CPU-bound —
+                # keep it off the loop the other scrapers share
+                jobs = await asyncio.to_thread(self._parse_next_data, match.group(1))
+            else:
+                self._log.debug("manfred.no_next_data_found")
+
+        except Exception as exc:
+            self._log.warning("manfred.html_fetch_error", error=str(exc))
 
-            except Exception as exc:
-                self._log.warning("manfred.html_fetch_error", error=str(exc))
+        return jobs
 
+    def _parse_next_data(self, blob: bytes) -> list[JobRecord]:
+        """Decode the __NEXT_DATA__ JSON and normalise the offers it carries."""
+        jobs: list[JobRecord] = []
+        for raw in self._dig_next_data(orjson.loads(blob)):
+            job = self._normalise_api_job(raw)
+            if job:
+                jobs.append(job)
         return jobs
 
-    def _dig_next_data(self, data: Any, depth: int = 0) -> list[dict]:
-        """Recursively search Next.js page props for offer lists."""
-        if depth > 8 or not isinstance(data, (dict, list)):
-            return []
+    def _dig_next_data(self, data: Any) -> list[dict]:
+        """Search Next.js page props for the offer list, shallowest match first."""
+        # Breadth-first with an explicit queue: no recursion, and the page-props
+        # list is found before any deeply nested look-alike
+        queue: deque[tuple[Any, int]] = deque([(data, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if depth > 8:
+                continue
 
-        if isinstance(data, list):
-            if all(isinstance(x, dict) and ("position" in x or "title" in x or "id" in x) for x in data[:3]) and data:
-                return data
-            result = []
-            for item in data:
-                result.extend(self._dig_next_data(item, depth + 1))
-            return result
+            if isinstance(node, dict):
+                for key in _OFFER_LIST_KEYS:
+                    value = node.get(key)
+                    if isinstance(value, list):
+                        return value
+                children = node.values()
+            elif isinstance(node, list):
+                if node and all(isinstance(x, dict) and ("position" in x or "title" in x or "id" in x) for x in node[:3]):
+                    return node
+                children = node
+            else:
+                continue
 
-        if isinstance(data, dict):
-            for key in ("offers", "jobs", "positions", "listings"):
-                if key in data and isinstance(data[key], list):
-                    return data[key]
-            result = []
-            for v in data.values():
-                result.extend(self._dig_next_data(v, depth + 1))
-            return result
+            queue.extend((child, depth + 1) for child in children if isinstance(child, (dict, list)))
 
         return []
 
@@ -266,18 +292,14 @@ class ManfredScraper(BaseScraper):
     # Filters and helpers
     # ------------------------------------------------------------------
 
-    def _is_relevant(self, job: dict) -> bool:
+    def _is_relevant(self, job: JobRecord) -> bool:
         """Accept only tech roles with Spain/Remote location."""
-        title = (job.get("title") or "").lower()
-        location = (job.get("location") or "").lower()
-
-        tech_match = any(kw in title for kw in self.TECH_KEYWORDS)
-        spain_match = any(kw in location for kw in SPAIN_KEYWORDS)
+        title = fold(job.title or "")
+        location = fold(job.location or "")
 
-        return tech_match and spain_match
+        return self._TECH_RE.search(title) is not None and _SPAIN_RE.search(location) is not None
 
     def _assign_cv_profile(self, title: str) -> str:
-        t = title.lower()
-        if any(kw in t for kw in ["frontend", "front-end", "react", "vue", "angular", "css", "html"]):
+        if _FRONTEND_RE.search(fold(title)):
             return "frontend_dev"
         return "fullstack_dev"
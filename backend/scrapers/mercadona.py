@@ -1,22 +1,48 @@
 """Mercadona Workday ATS scraper."""
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import re
 from typing import Any, Optional
 
 import httpx
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+from backend.scrapers.base import (
+    BaseScraper,
+    JobRecord,
+    cached_result,
+    classify,
+    conditional_headers,
+    first_value,
+    fold,
+    get_http_client,
+    keyword_pattern,
+    remember_result,
+    synthetic_id,
+)
+
+try:
+    import lxml  # noqa: F401 — C-backed tree builder for bs4
+    _LXML_AVAILABLE = True
+except ImportError:
+    _LXML_AVAILABLE = False
 
 log = structlog.get_logger(__name__)
 
 RELEVANT_KEYWORDS = [
-    "cajero", "cajera", "reponedor", "reponedora", "almacén", "almacen",
-    "tienda", "logística", "logistica", "operario", "operaria",
+    "cajero", "cajera", "reponedor", "reponedora", "almacen",
+    "tienda", "logistica", "operario", "operaria",
     "mozo", "dependiente", "dependienta",
 ]
 
+_PROFILE_RULES: list[tuple[re.Pattern[str], str]] = [
+    (keyword_pattern(["cajero", "cajera", "caja", "dependiente", "atencion al cliente"]), "cashier"),
+    (keyword_pattern(["reponedor", "reponedora", "almacen", "stock", "operario", "mozo"]), "stocker"),
+    (keyword_pattern(["logistica", "transporte", "reparto", "distribucion"]), "logistics"),
+]
+
 
 class MercadonaScraper(BaseScraper):
     """Scrape Mercadona's Workday ATS for store/logistics positions."""
@@ -43,79 +69,92 @@ class MercadonaScraper(BaseScraper):
     # Main scrape
     # ------------------------------------------------------------------
 
-    async def scrape(self) -> list[dict]:
-        all_jobs: list[dict] = []
-
-        async with httpx.AsyncClient(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        ) as client:
-            # Strategy 1: Try Workday public job search API (no auth required)
-            jobs = await self._fetch_via_api(client)
-            if jobs:
-                all_jobs.extend(jobs)
-                self._log.info("mercadona.api_success", count=len(jobs))
-            else:
-                # Strategy 2: Try RSS/XML feed
-                self._log.info("mercadona.trying_xml_feed")
-                jobs = await self._fetch_via_xml(client)
-                all_jobs.extend(jobs)
-
-        # Deduplicate
-        seen: set[str] = set()
-        unique: list[dict] = []
+    async def scrape(self) -> list[JobRecord]:
+        all_jobs: list[JobRecord] = []
+
+        # Shared HTTP/2 client: both strategies and every page reuse one connection
+        client = get_http_client()
+
+        # Strategy 1: Try Workday public job search API (no auth required)
+        jobs = await self._fetch_via_api(client)
+        if jobs:
+            all_jobs.extend(jobs)
+            self._log.info("mercadona.api_success", count=len(jobs))
+        else:
+            # Strategy 2: Try RSS/XML feed
+            self._log.info("mercadona.trying_xml_feed")
+            jobs = await self._fetch_via_xml(client)
+            all_jobs.extend(jobs)
+
+        # Deduplicate — keyed by external_id, first occurrence wins
+        unique: dict[str, JobRecord] = {}
         for job in all_jobs:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
+            unique.setdefault(job.external_id, job)
 
         self._log.info("mercadona.total", total=len(unique))
-        return unique
+        return list(unique.values())
 
     # ------------------------------------------------------------------
     # Strategy 1: Workday internal job search API
     # ------------------------------------------------------------------
 
-    async def _fetch_via_api(self, client: httpx.AsyncClient) -> list[dict]:
+    async def _fetch_via_api(self, client: httpx.AsyncClient) -> list[JobRecord]:
         """Attempt unauthenticated access to Workday job search service."""
-        jobs: list[dict] = []
-        offset = 0
         limit = 20
+        # The total isn't known up front, so pages are requested a batch at a time
+        batch = 5
 
-        while True:
+        async def fetch_page(offset: int) -> Optional[list[JobRecord]]:
+            """Jobs on one page; None when the API requires auth."""
             url = (
                 f"{self.WORKDAY_BASE}/wday/authgwy/mercadona/"
                 f"job-search-service/jobs?offset={offset}&limit={limit}"
             )
+            # Taken before the request, so a batch's pages share the rate
+            await self._rate_limit()
             try:
-                response = await client.get(url, timeout=20.0)
+                response = await client.get(url, headers=conditional_headers(url, self.HEADERS), timeout=20.0)
+                if response.status_code == 304:
+                    return cached_result(url)
                 if response.status_code == 401:
                     self._log.debug("mercadona.api_requires_auth")
-                    return []
+                    return None
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
             except httpx.HTTPStatusError as exc:
                 if exc.response.status_code in (401, 403):
-                    return []
+                    return None
                 self._log.warning("mercadona.api_error", error=str(exc))
-                return jobs
+                return []
             except Exception as exc:
                 self._log.warning("mercadona.api_exception", error=str(exc))
-                return jobs
+                return []
 
             page_jobs = self._parse_api_response(data)
-            if not page_jobs:
-                break
-
-            jobs.extend(page_jobs)
-            offset += limit
-
-            if len(page_jobs) < limit:
-                break
-
-            await self._rate_limit()
+            remember_result(url, response, page_jobs)
+            return page_jobs
+
+        first_page = await fetch_page(0)
+        if not first_page:
+            return []
+        # Copied: the page list may be the cached result of an earlier run
+        jobs = list(first_page)
+
+        offset = limit
+        more = len(jobs) == limit
+        while more:
+            pages = await asyncio.gather(
+                *(fetch_page(offset + i * limit) for i in range(batch))
+            )
+            if any(page_jobs is None for page_jobs in pages):
+                return []
+            for page_jobs in pages:
+                jobs.extend(page_jobs)
+                # A short page is the last one; anything after it is empty
+                if len(page_jobs) < limit:
+                    more = False
+                    break
+            offset += batch * limit
 
         return jobs
 
@@ -123,11 +162,14 @@ class MercadonaScraper(BaseScraper):
     # Strategy 2: Workday public XML/HTML feed
     # ------------------------------------------------------------------
 
-    async def _fetch_via_xml(self, client: httpx.AsyncClient) -> list[dict]:
+    async def _fetch_via_xml(self, client: httpx.AsyncClient) -> list[JobRecord]:
         """Fall back to scraping the public Workday jobs page."""
-        jobs: list[dict] = []
+        jobs: list[JobRecord] = []
         page = 0
         limit = 20
+        # Which endpoint serves pages this run: probed on the first page, after
+        # which a failing JSON endpoint is no longer requested before the HTML
+        mode: Optional[str] = None
 
         while True:
             url = (
@@ -135,16 +177,21 @@ class MercadonaScraper(BaseScraper):
                 f"?offset={page * limit}&limit={limit}"
             )
             try:
-                # Try JSON endpoint first
-                json_url = (
-                    f"{self.WORKDAY_BASE}/wday/authgwy/mercadona/job-search-service/jobs"
-                    f"?offset={page * limit}&limit={limit}"
-                )
-                resp = await client.get(json_url, timeout=20.0)
-                if resp.status_code == 200:
-                    try:
-                        data = resp.json()
-                        page_jobs = self._parse_api_response(data)
+                if mode != "html":
+                    # Try JSON endpoint first
+                    json_url = (
+                        f"{self.WORKDAY_BASE}/wday/authgwy/mercadona/job-search-service/jobs"
+                        f"?offset={page * limit}&limit={limit}"
+                    )
+                    resp = await client.get(json_url, headers=self.HEADERS, timeout=20.0)
+                    page_jobs: Optional[list[JobRecord]] = None
+                    if resp.status_code == 200:
+                        try:
+                            page_jobs = self._parse_api_response(orjson.loads(resp.content))
+                        except Exception:
+                            pass
+                    if page_jobs is not None:
+                        mode = "json"
                         if not page_jobs:
                             break
                         jobs.extend(page_jobs)
@@ -153,13 +200,14 @@ class MercadonaScraper(BaseScraper):
                         page += 1
                         await self._rate_limit()
                         continue
-                    except Exception:
-                        pass
+                    if mode is None:
+                        mode = "html"
 
                 # HTML fallback
-                resp = await client.get(url, timeout=20.0)
+                resp = await client.get(url, headers=self.HEADERS, timeout=20.0)
                 resp.raise_for_status()
-                html_jobs = self._parse_html_response(resp.text)
+                # Parsing is CPU-bound — keep it off the loop the other scrapers share
+                html_jobs = await asyncio.to_thread(self._parse_html_response, resp.content)
                 if not html_jobs:
                     break
                 jobs.extend(html_jobs)
@@ -178,21 +226,15 @@ class MercadonaScraper(BaseScraper):
     # Response parsers
     # ------------------------------------------------------------------
 
-    def _parse_api_response(self, data: Any) -> list[dict]:
+    def _parse_api_response(self, data: Any) -> list[JobRecord]:
         raw_list: list[dict] = []
 
         if isinstance(data, dict):
-            raw_list = (
-                data.get("jobPostings")
-                or data.get("jobs")
-                or data.get("results")
-                or data.get("data")
-                or []
-            )
+            raw_list = first_value(data, ("jobPostings", "jobs", "results", "data"), [])
         elif isinstance(data, list):
             raw_list = data
 
-        result: list[dict] = []
+        result: list[JobRecord] = []
         for raw in raw_list:
             if not isinstance(raw, dict):
                 continue
@@ -201,31 +243,19 @@ class MercadonaScraper(BaseScraper):
                 result.append(job)
         return result
 
-    def _normalise_api_job(self, raw: dict) -> Optional[dict]:
-        external_id = str(
-            raw.get("bulletinId")
-            or raw.get("id")
-            or raw.get("externalId")
-            or raw.get("jobPostingId")
-            or ""
-        )
+    def _normalise_api_job(self, raw: dict) -> Optional[JobRecord]:
+        title = raw.get("title") or raw.get("jobTitle") or ""
+
+        external_id = str(first_value(raw, ("bulletinId", "id", "externalId", "jobPostingId")))
         if not external_id:
-            title_raw = raw.get("title") or raw.get("jobTitle") or ""
             loc_raw = raw.get("locationsText") or raw.get("location") or ""
-            external_id = self._synthetic_id(title_raw, str(loc_raw))
+            external_id = self._synthetic_id(title, str(loc_raw))
 
-        title = raw.get("title") or raw.get("jobTitle") or ""
-        location = (
-            raw.get("locationsText")
-            or raw.get("location")
-            or raw.get("primaryLocation")
-            or "España"
-        )
+        location = first_value(raw, ("locationsText", "location", "primaryLocation"), "España")
         if isinstance(location, dict):
             location = location.get("descriptor") or location.get("name") or "España"
 
         description = raw.get("jobDescription") or raw.get("description") or ""
-        posted_at = raw.get("postedOn") or raw.get("publishedOn") or None
 
         url_path = raw.get("externalPath") or raw.get("url") or ""
         url = (
@@ -235,27 +265,35 @@ class MercadonaScraper(BaseScraper):
         )
 
         cv_profile = self._assign_cv_profile(title)
+        schedule = raw.get("jobSchedule")
+
+        return JobRecord(
+            site=self.SITE,
+            external_id=external_id,
+            url=url,
+            title=title,
+            company=self.COMPANY,
+            location=location,
+            description=description,
+            salary_raw=None,
+            contract_type=schedule.get("descriptor") if isinstance(schedule, dict) else None,
+            cv_profile=cv_profile,
+            raw_data=raw if self.STORE_RAW else None,
+        )
 
-        return {
-            "site": self.SITE,
-            "external_id": external_id,
-            "url": url,
-            "title": title,
-            "company": self.COMPANY,
-            "location": location,
-            "description": description,
-            "salary_raw": None,
-            "contract_type": raw.get("jobSchedule", {}).get("descriptor") if isinstance(raw.get("jobSchedule"), dict) else None,
-            "cv_profile": cv_profile,
-            "raw_data": raw,
-        }
-
-    def _parse_html_response(self, html: str) -> list[dict]:
+    def _parse_html_response(self, html: bytes) -> list[JobRecord]:
         """Very basic HTML parser fallback using string search."""
-        jobs: list[dict] = []
+        jobs: list[JobRecord] = []
         try:
             from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, "html.parser")
+            if not _LXML_AVAILABLE:
+                features = "html.parser"
+            elif html.lstrip().startswith(b"<?xml"):
+                # Workday occasionally serves the listing as an XML feed
+                features = "lxml-xml"
+            else:
+                features = "lxml"
+            soup = BeautifulSoup(html, features)
             for card in soup.select("[data-automation-id='jobPostingsList'] li, .job-posting-item, li[class*='job']"):
                 try:
                     title_el = card.find(["h3", "h2", "a"])
@@ -268,19 +306,19 @@ class MercadonaScraper(BaseScraper):
                     location = loc_el.get_text(strip=True) if loc_el else "España"
                     external_id = self._synthetic_id(title, location)
                     if title:
-                        jobs.append({
-                            "site": self.SITE,
-                            "external_id": external_id,
-                            "url": href,
-                            "title": title,
-                            "company": self.COMPANY,
-                            "location": location,
-                            "description": None,
-                            "salary_raw": None,
-                            "contract_type": None,
-                            "cv_profile": self._assign_cv_profile(title),
-                            "raw_data": {"title": title, "location": location},
-                        })
+                        jobs.append(JobRecord(
+                            site=self.SITE,
+                            external_id=external_id,
+                            url=href,
+                            title=title,
+                            company=self.COMPANY,
+                            location=location,
+                            description=None,
+                            salary_raw=None,
+                            contract_type=None,
+                            cv_profile=self._assign_cv_profile(title),
+                            raw_data={"title": title, "location": location},
+                        ))
                 except Exception:
                     pass
         except ImportError:
@@ -294,15 +332,7 @@ class MercadonaScraper(BaseScraper):
     # ------------------------------------------------------------------
 
     def _synthetic_id(self, title: str, location: str) -> str:
-        raw = f"{self.SITE}|{title.lower()}|{location.lower()}"
-        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+        return synthetic_id(self.SITE, title.lower(), location.lower())
 
     def _assign_cv_profile(self, title: str) -> str:
-        t = title.lower()
-        if any(kw in t for kw in ["cajero", "cajera", "caja", "dependiente", "atención al cliente"]):
-            return "cashier"
-        if any(kw in t for kw in ["reponedor", "reponedora", "almacén", "almacen", "stock", "operario", "mozo"]):
-            return "stocker"
-        if any(kw in t for kw in ["logística", "logistica", "transporte", "reparto", "distribución"]):
-            return "logistics"
-        return "stocker"
+        return classify(fold(title), _PROFILE_RULES, "stocker")
@@ -1,17 +1,86 @@
 """Personio ATS platform scraper — httpx with JSON-first, HTML fallback."""
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import re
+from html import unescape
 from typing import Any, Optional
 from urllib.parse import urljoin
 
 import httpx
+import orjson
 import structlog
 
-from backend.scrapers.base import BaseScraper
+try:
+    from bs4 import BeautifulSoup
+    _BS4_AVAILABLE = True
+except ImportError:
+    _BS4_AVAILABLE = False
+
+try:
+    import lxml  # noqa: F401 — C-backed tree builder for bs4
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+from backend.scrapers.base import (
+    BaseScraper,
+    classify,
+    get_http_client,
+    keyword_pattern,
+    synthetic_id,
+)
 
 log = structlog.get_logger(__name__)
 
+# Job card selectors for the public careers page, tried in order
+CARD_SELECTORS = (
+    ".job-listing",
+    "[class*='job-item']",
+    "[data-job-id]",
+    "li[class*='opening']",
+    ".opening",
+)
+
+# Compiled once rather than per page
+_LOCATION_CLASS_RE = re.compile("location", re.I)
+_JOB_HREF_RE = re.compile(r"/job/")
+
+# schema.org JSON-LD blocks, searched in the raw page bytes
+_JSON_LD_RE = re.compile(rb'<script[^>]*application/ld\+json[^>]*>(.*?)</script>', re.DOTALL)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _text(value: Any) -> str:
+    """*value* as stripped text if it is a JSON scalar, else ``""``."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return ""
+
+
+def _html_to_text(markup: str) -> str:
+    """Plain text of a JSON-LD description, which may be (escaped) HTML."""
+    if "&lt;" in markup:
+        markup = unescape(markup)
+    if "<" not in markup:
+        return unescape(markup)
+    if _BS4_AVAILABLE:
+        return BeautifulSoup(markup, _HTML_PARSER).get_text("\n", strip=True)
+    return unescape(_TAG_RE.sub(" ", markup)).strip()
+
+
+_PROFILE_RULES: list[tuple[re.Pattern[str], str]] = [
+    (keyword_pattern(["frontend", "front-end", "react", "vue", "angular"]), "frontend_dev"),
+    (keyword_pattern([
+        "fullstack", "full stack", "backend", "software", "developer",
+        "engineer", "python", "java", "node",
+    ]), "fullstack_dev"),
+    (keyword_pattern(["logistics", "logística", "warehouse", "almacén", "driver", "reparto"]), "logistics"),
+]
+
 # Spanish companies and SMEs known to use Personio
 DEFAULT_COMPANIES: dict[str, dict[str, str]] = {
     "holded": {"cv_profile": "fullstack_dev", "name": "Holded"},
@@ -70,33 +139,37 @@ class PersonioScraper(BaseScraper):
         except Exception as exc:
             self._log.warning("personio.db_sources_error", error=str(exc))
 
-        all_jobs: list[dict] = []
+        unique: dict[str, dict] = {}
+        # Companies are independent — fetch them concurrently, a few at a time
+        sem = asyncio.Semaphore(10)
+
+        # Shared HTTP/2 client: connections stay warm across companies and runs
+        client = get_http_client()
 
-        async with httpx.AsyncClient(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        ) as client:
-            for slug, meta in companies.items():
+        async def fetch_bounded(slug: str, meta: dict[str, str]) -> list[dict]:
+            async with sem:
                 cv_profile = meta.get("cv_profile", "fullstack_dev")
                 company_name = meta.get("name", slug.capitalize())
                 self._log.info("personio.fetching", slug=slug)
                 jobs = await self._fetch_company(client, slug, cv_profile, company_name)
-                all_jobs.extend(jobs)
                 self._log.info("personio.company_done", slug=slug, found=len(jobs))
                 await self._rate_limit()
+                return jobs
 
-        # Deduplicate
-        seen: set[str] = set()
-        unique: list[dict] = []
-        for job in all_jobs:
-            eid = job.get("external_id", "")
-            if eid not in seen:
-                seen.add(eid)
-                unique.append(job)
+        results = await asyncio.gather(
+            *(fetch_bounded(slug, meta) for slug, meta in companies.items()),
+            return_exceptions=True,
+        )
+
+        for slug, result in zip(companies, results):
+            if isinstance(result, BaseException):
+                self._log.warning("personio.fetch_error", slug=slug, error=str(result))
+                continue
+            for job in result:
+                unique.setdefault(job["external_id"], job)
 
         self._log.info("personio.total", total=len(unique))
-        return unique
+        return list(unique.values())
 
     # ------------------------------------------------------------------
     # Per-company fetch
@@ -117,7 +190,7 @@ class PersonioScraper(BaseScraper):
             )
             if resp.status_code == 200:
                 try:
-                    data = resp.json()
+                    data = orjson.loads(resp.content)
                     jobs = self._parse_json_response(data, slug, cv_profile, company_name)
                     if jobs:
                         self._log.debug("personio.json_success", slug=slug, count=len(jobs))
@@ -130,9 +203,14 @@ class PersonioScraper(BaseScraper):
         # Strategy 2: HTML page scrape
         page_url = self.PUBLIC_PAGE.format(company=slug)
         try:
-            resp = await client.get(page_url, timeout=20.0)
+            resp = await client.get(page_url, headers=self.HEADERS, timeout=20.0)
             if resp.status_code == 200:
-                jobs = self._parse_html_response(resp.text, slug, cv_profile, company_name, page_url)
+                # Embedded JSON-LD postings spare building the BeautifulSoup tree
+                jobs = self._parse_json_ld(
+                    resp.content, slug, cv_profile, company_name, page_url
+                ) or self._parse_html_response(
+                    resp.content, slug, cv_profile, company_name, page_url
+                )
                 self._log.debug("personio.html_fallback", slug=slug, count=len(jobs))
         except Exception as exc:
             self._log.warning("personio.html_fetch_error", slug=slug, error=str(exc))
@@ -207,40 +285,112 @@ class PersonioScraper(BaseScraper):
             "salary_raw": None,
             "contract_type": employment_type,
             "cv_profile": self._assign_cv_profile(title, cv_profile),
-            "raw_data": raw,
+            "raw_data": raw if self.STORE_RAW else None,
         }
 
     # ------------------------------------------------------------------
-    # HTML fallback parser
+    # HTML fallback parsers
     # ------------------------------------------------------------------
 
+    def _parse_json_ld(
+        self, html: bytes, slug: str, cv_profile: str, company_name: str, base_url: str
+    ) -> list[dict]:
+        """JobPosting entries from the page's JSON-LD blocks; empty if there are none."""
+        postings: list[dict] = []
+        for match in _JSON_LD_RE.finditer(html):
+            try:
+                data = orjson.loads(match.group(1))
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(data, dict):
+                data = data.get("@graph") or [data]
+            if isinstance(data, dict):
+                data = [data]
+            if isinstance(data, list):
+                postings.extend(
+                    item for item in data
+                    if isinstance(item, dict) and item.get("@type") == "JobPosting"
+                )
+
+        jobs: list[dict] = []
+        for raw in postings:
+            try:
+                job = self._normalise_json_ld_job(raw, slug, cv_profile, company_name, base_url)
+            except Exception as exc:
+                self._log.debug("personio.json_ld_job_error", slug=slug, error=str(exc))
+                continue
+            if job:
+                jobs.append(job)
+        return jobs
+
+    def _normalise_json_ld_job(
+        self, raw: dict, slug: str, cv_profile: str, company_name: str, base_url: str
+    ) -> Optional[dict]:
+        title = _text(raw.get("title"))
+        if not title:
+            return None
+        url = _text(raw.get("url"))
+        identifier = raw.get("identifier")
+        if isinstance(identifier, dict):
+            identifier = identifier.get("value")
+        external_id = (
+            url.rstrip("/").split("/")[-1]
+            or _text(identifier)
+            or self._synthetic_id(title, slug)
+        )
+
+        location = ""
+        job_location = raw.get("jobLocation")
+        if isinstance(job_location, list):
+            job_location = job_location[0] if job_location else None
+        if isinstance(job_location, dict):
+            address = job_location.get("address")
+            if isinstance(address, dict):
+                address = address.get("addressLocality")
+            location = _text(address)
+
+        employment_type = raw.get("employmentType")
+        if isinstance(employment_type, list):
+            employment_type = ", ".join(str(x) for x in employment_type)
+
+        description = _text(raw.get("description"))
+
+        return {
+            "site": self.SITE,
+            "external_id": f"{slug}_{external_id}",
+            "url": urljoin(base_url, url) if url else base_url,
+            "title": title,
+            "company": company_name,
+            "location": location or "España",
+            "description": _html_to_text(description) if description else None,
+            "salary_raw": None,
+            "contract_type": _text(employment_type) or None,
+            "cv_profile": self._assign_cv_profile(title, cv_profile),
+            "raw_data": raw if self.STORE_RAW else None,
+        }
+
     def _parse_html_response(
-        self, html: str, slug: str, cv_profile: str, company_name: str, base_url: str
+        self, html: bytes, slug: str, cv_profile: str, company_name: str, base_url: str
     ) -> list[dict]:
         jobs: list[dict] = []
 
+        if not _BS4_AVAILABLE:
+            self._log.warning("personio.bs4_unavailable", tip="pip install beautifulsoup4")
+            return jobs
+
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, _HTML_PARSER)
 
             # Look for job listing elements
-            selectors = [
-                ".job-listing",
-                "[class*='job-item']",
-                "[data-job-id]",
-                "li[class*='opening']",
-                ".opening",
-            ]
             cards = []
-            for sel in selectors:
+            for sel in CARD_SELECTORS:
                 cards = soup.select(sel)
                 if cards:
                     break
 
             # Fallback: any link that goes to /job/
             if not cards:
-                import re
-                links = soup.find_all("a", href=re.compile(r"/job/"))
+                links = soup.find_all("a", href=_JOB_HREF_RE)
                 for link in links:
                     title = link.get_text(strip=True)
                     href = link.get("href", "")
@@ -269,7 +419,7 @@ class PersonioScraper(BaseScraper):
                     title = title_el.get_text(strip=True) if title_el else ""
                     href = link_el.get("href", "") if link_el else ""
                     url = urljoin(base_url, href)
-                    loc_el = card.find(class_=lambda c: c and "location" in str(c).lower())
+                    loc_el = card.find(class_=_LOCATION_CLASS_RE)
                     location = loc_el.get_text(strip=True) if loc_el else "España"
                     external_id = href.split("/")[-1] or self._synthetic_id(title, slug)
                     if title:
@@ -289,8 +439,6 @@ class PersonioScraper(BaseScraper):
                 except Exception:
                     pass
 
-        except ImportError:
-            self._log.warning("personio.bs4_unavailable", tip="pip install beautifulsoup4")
         except Exception as exc:
             self._log.warning("personio.html_parse_error", slug=slug, error=str(exc))
 
@@ -301,15 +449,7 @@ class PersonioScraper(BaseScraper):
     # ------------------------------------------------------------------
 
     def _synthetic_id(self, title: str, slug: str) -> str:
-        raw = f"{self.SITE}|{slug}|{title.lower()}"
-        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+        return synthetic_id(self.SITE, slug, title.lower())
 
     def _assign_cv_profile(self, title: str, default: str) -> str:
-        t = title.lower()
-        if any(kw in t for kw in ["frontend", "front-end", "react", "vue", "angular"]):
-            return "frontend_dev"
-        if any(kw in t for kw in ["fullstack", "full stack", "backend", "software", "developer", "engineer", "python", "java", "node"]):
-            return "fullstack_dev"
-        if any(kw in t for kw in ["logistics", "logística", "warehouse", "almacén", "driver", "reparto"]):
-            return "logistics"
-        return default
+        return classify(title.lower(), _PROFILE_RULES, default)
@@ -205,7 +205,7 @@ class TeamtailorScraper(BaseScraper):
             "salary_raw": None,
             "contract_type": employment_type,
             "cv_profile": self._assign_cv_profile(title, cv_profile),
-            "raw_data": raw,
+            "raw_data": raw if self.STORE_RAW else None,
         }
 
     # ------------------------------------------------------------------
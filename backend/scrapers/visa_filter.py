@@ -71,6 +71,19 @@ _PARTTIME_KEYWORDS = {
     "jornada reducida",
 }
 
+
+def _keyword_pattern(keywords: set[str]) -> re.Pattern[str]:
+    """Compile *keywords* into one alternation so a text is scanned in a single pass.
+
+    Longer keywords come first so the reported match is the most specific one.
+    """
+    ordered = sorted(keywords, key=lambda kw: (-len(kw), kw))
+    return re.compile("|".join(re.escape(kw) for kw in ordered))
+
+
+_TEMPORAL_PATTERN = _keyword_pattern(_TEMPORAL_KEYWORDS)
+_PARTTIME_PATTERN = _keyword_pattern(_PARTTIME_KEYWORDS)
+
 # Part-time hour patterns: e.g. "20 horas", "25h/semana", "30h semanales"
 # We consider anything strictly under 35h/week to be part-time
 _HOUR_PATTERN = re.compile(
@@ -110,14 +123,14 @@ def is_eligible(job_data: dict) -> tuple[bool, Optional[str]]:
     # ------------------------------------------------------------------
     # 1. Temporal contract check
     # ------------------------------------------------------------------
-    matched_temporal = _find_keyword(full_text, _TEMPORAL_KEYWORDS)
+    matched_temporal = _find_keyword(full_text, _TEMPORAL_PATTERN)
     if matched_temporal:
         return False, f"temporal contract detected: '{matched_temporal}'"
 
     # ------------------------------------------------------------------
     # 2. Part-time check (keywords)
     # ------------------------------------------------------------------
-    matched_parttime = _find_keyword(full_text, _PARTTIME_KEYWORDS)
+    matched_parttime = _find_keyword(full_text, _PARTTIME_PATTERN)
     if matched_parttime:
         return False, f"part-time detected: '{matched_parttime}'"
 
@@ -153,12 +166,10 @@ def contract_type_expanded(raw: str) -> str:
     return mapping.get(raw.strip(), raw)
 
 
-def _find_keyword(text: str, keywords: set[str]) -> Optional[str]:
-    """Return the first matching keyword found in text, or None."""
-    for kw in keywords:
-        if kw in text:
-            return kw
-    return None
+def _find_keyword(text: str, pattern: re.Pattern[str]) -> Optional[str]:
+    """Return the first keyword of *pattern* found in text, or None."""
+    m = pattern.search(text)
+    return m.group(0) if m else None
 
 
 def _check_hours(text: str) -> Optional[str]:
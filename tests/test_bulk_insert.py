@@ -0,0 +1,311 @@
+"""
+Tests for the scraper persistence path:
+backend/database/crud.py (bulk_insert_jobs, get_known_external_ids) and
+BaseScraper.run in backend/scrapers/base.py.
+
+Runs against an in-memory aiosqlite database.
+"""
+import asyncio
+import sys
+import os
+from datetime import datetime
+
+# Allow running from project root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import patch
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.database import crud
+from backend.database.crud import bulk_insert_jobs, get_known_external_ids
+from backend.database.models import Base, Job
+from backend.scrapers import base as scraper_base
+from backend.scrapers.base import BaseScraper, JobRecord
+
+
+SITE = "testsite"
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def row(external_id: str, **kwargs) -> dict:
+    """Build a minimal insertable job row."""
+    return {
+        "site": SITE,
+        "external_id": external_id,
+        "url": f"https://example.com/{external_id}",
+        "title": "Cajero",
+        "company": "ACME",
+        **kwargs,
+    }
+
+
+def record(external_id: str, **kwargs) -> JobRecord:
+    return JobRecord(
+        site=SITE,
+        external_id=external_id,
+        url=f"https://example.com/{external_id}",
+        title=kwargs.get("title", "Cajero"),
+        company="ACME",
+        location="Madrid",
+        description=kwargs.get("description", ""),
+        salary_raw=None,
+        contract_type=kwargs.get("contract_type"),
+        cv_profile="cashier",
+        raw_data=kwargs.get("raw_data"),
+    )
+
+
+async def make_session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def stored_jobs(session_factory) -> dict[str, Job]:
+    async with session_factory() as db:
+        result = await db.execute(select(Job).where(Job.site == SITE))
+        return {job.external_id: job for job in result.scalars().all()}
+
+
+class StaticScraper(BaseScraper):
+    """Scraper whose scrape() returns a fixed list of jobs."""
+
+    def __init__(self, session_factory, jobs) -> None:
+        super().__init__(SITE, session_factory)
+        self._jobs = jobs
+
+    async def scrape(self):
+        return self._jobs
+
+
+# ===========================================================================
+# 1. bulk_insert_jobs / get_known_external_ids
+# ===========================================================================
+
+class TestBulkInsertJobs:
+
+    def test_empty_rows_insert_nothing(self):
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                assert await bulk_insert_jobs(db, []) == set()
+            await engine.dispose()
+
+        asyncio.run(scenario())
+
+    def test_duplicate_within_batch_is_ignored(self):
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                inserted = await bulk_insert_jobs(
+                    db, [row("a", title="First"), row("a", title="Second"), row("b")]
+                )
+                await db.commit()
+            jobs = await stored_jobs(session_factory)
+            await engine.dispose()
+            return inserted, jobs
+
+        inserted, jobs = asyncio.run(scenario())
+        assert inserted == {(SITE, "a"), (SITE, "b")}
+        assert set(jobs) == {"a", "b"}
+        assert jobs["a"].title == "First"
+
+    def test_reinsert_returns_empty_set(self):
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                first = await bulk_insert_jobs(db, [row("a"), row("b")])
+                await db.commit()
+            async with session_factory() as db:
+                second = await bulk_insert_jobs(db, [row("a"), row("b")])
+                await db.commit()
+            await engine.dispose()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert first == {(SITE, "a"), (SITE, "b")}
+        assert second == set()
+
+    def test_rows_beyond_one_chunk_are_all_inserted(self):
+        n = crud._BULK_INSERT_CHUNK * 2 + 7
+
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                inserted = await bulk_insert_jobs(db, [row(str(i)) for i in range(n)])
+                await db.commit()
+            async with session_factory() as db:
+                known = await get_known_external_ids(db, SITE)
+            await engine.dispose()
+            return inserted, known
+
+        inserted, known = asyncio.run(scenario())
+        assert len(inserted) == n
+        assert known == {str(i) for i in range(n)}
+
+    def test_unknown_keys_are_dropped_and_status_defaults(self):
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                await bulk_insert_jobs(db, [row("a", not_a_column=1)])
+                await db.commit()
+            jobs = await stored_jobs(session_factory)
+            await engine.dispose()
+            return jobs
+
+        jobs = asyncio.run(scenario())
+        assert jobs["a"].status == "scraped"
+
+    def test_bad_rows_are_skipped_and_reported(self):
+        errors: list[str] = []
+
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                inserted = await bulk_insert_jobs(
+                    db,
+                    [row("a"), row("no-title", title=None), row("bad-date", posted_at="yesterday"), row("b")],
+                    on_error=lambda bad, exc: errors.append(bad["external_id"]),
+                )
+                await db.commit()
+            jobs = await stored_jobs(session_factory)
+            await engine.dispose()
+            return inserted, jobs
+
+        inserted, jobs = asyncio.run(scenario())
+        assert inserted == {(SITE, "a"), (SITE, "b")}
+        assert set(jobs) == {"a", "b"}
+        assert sorted(errors) == ["bad-date", "no-title"]
+
+    def test_absent_columns_keep_their_defaults(self):
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                inserted = await bulk_insert_jobs(
+                    db, [row("a", scraped_at=datetime(2026, 1, 1)), row("b")]
+                )
+                await db.commit()
+            jobs = await stored_jobs(session_factory)
+            await engine.dispose()
+            return inserted, jobs
+
+        inserted, jobs = asyncio.run(scenario())
+        assert inserted == {(SITE, "a"), (SITE, "b")}
+        assert jobs["a"].scraped_at == datetime(2026, 1, 1)
+        assert jobs["b"].scraped_at is not None
+        assert jobs["b"].status == "scraped"
+
+    def test_known_ids_are_scoped_to_site(self):
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                await bulk_insert_jobs(db, [row("a"), row("b", site="other")])
+                await db.commit()
+            async with session_factory() as db:
+                known = await get_known_external_ids(db, SITE)
+            await engine.dispose()
+            return known
+
+        assert asyncio.run(scenario()) == {"a"}
+
+
+# ===========================================================================
+# 2. BaseScraper.run
+# ===========================================================================
+
+class TestScraperRun:
+
+    def test_visa_filtered_job_is_stored_skipped_but_not_counted(self):
+        jobs = [
+            record("ok"),
+            record("temp", contract_type="temporal"),
+        ]
+
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            stats = await StaticScraper(session_factory, jobs).run()
+            stored = await stored_jobs(session_factory)
+            await engine.dispose()
+            return stats, stored
+
+        stats, stored = asyncio.run(scenario())
+        assert stats["jobs_found"] == 2
+        assert stats["jobs_new"] == 1
+        assert stored["ok"].status == "scraped"
+        assert stored["temp"].status == "skipped"
+        assert "temporal" in stored["temp"].raw_data["_skip_reason"]
+
+    def test_known_ids_are_skipped_before_filtering(self):
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            async with session_factory() as db:
+                await bulk_insert_jobs(db, [row("old")])
+                await db.commit()
+
+            jobs = [record("old", contract_type="temporal"), record("new")]
+            with patch.object(
+                scraper_base, "is_eligible", wraps=scraper_base.is_eligible
+            ) as spy:
+                stats = await StaticScraper(session_factory, jobs).run()
+            checked = [call.args[0]["external_id"] for call in spy.call_args_list]
+            stored = await stored_jobs(session_factory)
+            await engine.dispose()
+            return stats, checked, stored
+
+        stats, checked, stored = asyncio.run(scenario())
+        assert checked == ["new"]
+        assert stats["jobs_found"] == 2
+        assert stats["jobs_new"] == 1
+        assert stored["old"].status == "scraped"
+
+    def test_invalid_job_does_not_abort_the_run(self):
+        jobs = [record("ok"), record("no-title", title=None), record("ok2")]
+
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            stats = await StaticScraper(session_factory, jobs).run()
+            stored = await stored_jobs(session_factory)
+            await engine.dispose()
+            return stats, stored
+
+        stats, stored = asyncio.run(scenario())
+        assert stats["status"] == "completed"
+        assert stats["jobs_found"] == 3
+        assert stats["jobs_new"] == 2
+        assert set(stored) == {"ok", "ok2"}
+
+    def test_duplicates_across_runs_are_not_new(self):
+        jobs = [record("a"), record("b")]
+
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            first = await StaticScraper(session_factory, jobs).run()
+            second = await StaticScraper(session_factory, jobs).run()
+            await engine.dispose()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert first["jobs_new"] == 2
+        assert second["jobs_new"] == 0
+        assert second["jobs_found"] == 2
+
+    def test_dict_results_are_accepted(self):
+        async def scenario():
+            engine, session_factory = await make_session_factory()
+            stats = await StaticScraper(session_factory, [row("d")]).run()
+            stored = await stored_jobs(session_factory)
+            await engine.dispose()
+            return stats, stored
+
+        stats, stored = asyncio.run(scenario())
+        assert stats["jobs_new"] == 1
+        assert set(stored) == {"d"}
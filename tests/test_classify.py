@@ -0,0 +1,62 @@
+"""
+Tests for classify() in backend/scrapers/base.py and the scrapers that
+assign CV profiles through it.
+"""
+import sys
+import os
+
+# Allow running from project root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from backend.scrapers.base import classify, keyword_pattern
+
+
+RULES = [
+    (keyword_pattern(["developer", "engineer"]), "fullstack_dev"),
+    (keyword_pattern(["cajero", "caja"]), "cashier"),
+]
+
+
+# ===========================================================================
+# 1. classify
+# ===========================================================================
+
+class TestClassify:
+
+    def test_first_matching_rule_wins(self):
+        assert classify("developer de caja", RULES, "logistics") == "fullstack_dev"
+
+    def test_later_rule_matches(self):
+        assert classify("cajero reponedor", RULES, "logistics") == "cashier"
+
+    def test_default_when_nothing_matches(self):
+        assert classify("mozo de almacen", RULES, "logistics") == "logistics"
+
+    def test_empty_rules_return_default(self):
+        assert classify("developer", [], "stocker") == "stocker"
+
+    def test_text_is_searched_as_given(self):
+        assert classify("Developer", RULES, "logistics") == "logistics"
+
+
+# ===========================================================================
+# 2. Scraper profile assignment
+# ===========================================================================
+
+class TestScraperProfiles:
+
+    def test_amazon_is_case_insensitive(self):
+        # The module imports the browser pool, which needs patchright or playwright
+        amazon_es = pytest.importorskip("backend.scrapers.amazon_es", exc_type=ImportError)
+        AmazonESScraper = amazon_es.AmazonESScraper
+        assert AmazonESScraper._assign_cv_profile("Software Development Engineer") == "fullstack_dev"
+        assert AmazonESScraper._assign_cv_profile("Mozo de Almacén") == "logistics"
+        assert AmazonESScraper._assign_cv_profile("Area Manager") == "logistics"
+
+    def test_mercadona_folds_accents(self):
+        pytest.importorskip("bs4")
+        from backend.scrapers.mercadona import MercadonaScraper
+        scraper = MercadonaScraper(None)
+        assert scraper._assign_cv_profile("Atención al Cliente") == "cashier"
@@ -0,0 +1,150 @@
+"""
+Tests for the conditional GET helpers in backend/scrapers/base.py
+(conditional_headers, remember_result, cached_result), and for
+BaseScraper.run leaving results reused on a 304 untouched.
+"""
+import asyncio
+import sys
+import os
+
+# Allow running from project root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.database.models import Base
+from backend.scrapers import base as scraper_base
+from backend.scrapers.base import (
+    BaseScraper,
+    JobRecord,
+    cached_result,
+    conditional_headers,
+    remember_result,
+)
+
+
+URL = "https://example.com/jobs?page=1"
+HEADERS = {"Accept": "application/json"}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    scraper_base._conditional_cache.clear()
+    yield
+    scraper_base._conditional_cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def response(**headers) -> httpx.Response:
+    return httpx.Response(200, headers={k.replace("_", "-"): v for k, v in headers.items()})
+
+
+# ===========================================================================
+# 1. conditional_headers / remember_result / cached_result
+# ===========================================================================
+
+class TestConditionalHeaders:
+
+    def test_unknown_url_returns_headers_unchanged(self):
+        assert conditional_headers(URL, HEADERS) is HEADERS
+
+    def test_etag_becomes_if_none_match(self):
+        remember_result(URL, response(ETag='"abc"'), ["job"])
+        assert conditional_headers(URL, HEADERS) == {**HEADERS, "If-None-Match": '"abc"'}
+
+    def test_last_modified_becomes_if_modified_since(self):
+        stamp = "Wed, 21 Oct 2026 07:28:00 GMT"
+        remember_result(URL, response(Last_Modified=stamp), ["job"])
+        assert conditional_headers(URL, HEADERS) == {**HEADERS, "If-Modified-Since": stamp}
+
+    def test_both_validators_are_sent(self):
+        stamp = "Wed, 21 Oct 2026 07:28:00 GMT"
+        remember_result(URL, response(ETag='"abc"', Last_Modified=stamp), ["job"])
+        sent = conditional_headers(URL, HEADERS)
+        assert sent["If-None-Match"] == '"abc"'
+        assert sent["If-Modified-Since"] == stamp
+
+    def test_caller_headers_are_not_mutated(self):
+        remember_result(URL, response(ETag='"abc"'), ["job"])
+        conditional_headers(URL, HEADERS)
+        assert HEADERS == {"Accept": "application/json"}
+
+    def test_cached_result_returns_remembered_parse(self):
+        jobs = ["a", "b"]
+        remember_result(URL, response(ETag='"abc"'), jobs)
+        assert cached_result(URL) is jobs
+
+    def test_response_without_validators_is_not_cached(self):
+        remember_result(URL, response(), ["job"])
+        assert conditional_headers(URL, HEADERS) is HEADERS
+        with pytest.raises(KeyError):
+            cached_result(URL)
+
+    def test_response_without_validators_evicts_entry(self):
+        remember_result(URL, response(ETag='"abc"'), ["old"])
+        remember_result(URL, response(), ["new"])
+        assert conditional_headers(URL, HEADERS) is HEADERS
+        with pytest.raises(KeyError):
+            cached_result(URL)
+
+    def test_new_validators_replace_old(self):
+        remember_result(URL, response(ETag='"v1"'), ["old"])
+        remember_result(URL, response(ETag='"v2"'), ["new"])
+        assert conditional_headers(URL, HEADERS)["If-None-Match"] == '"v2"'
+        assert cached_result(URL) == ["new"]
+
+
+# ===========================================================================
+# 2. BaseScraper.run with cached results
+# ===========================================================================
+
+class CachedPageScraper(BaseScraper):
+    """Scraper that serves one page's jobs from the conditional-GET cache."""
+
+    def __init__(self, session_factory) -> None:
+        super().__init__("testsite", session_factory)
+
+    async def scrape(self):
+        return cached_result(URL)
+
+
+class TestRunKeepsCachedResults:
+
+    def test_skip_reason_is_not_written_into_cached_raw_data(self):
+        raw = {"id": "temp"}
+        job = JobRecord(
+            site="testsite",
+            external_id="temp",
+            url="https://example.com/temp",
+            title="Cajero",
+            company="ACME",
+            location="Madrid",
+            description="",
+            salary_raw=None,
+            contract_type="temporal",
+            cv_profile="cashier",
+            raw_data=raw,
+        )
+        remember_result(URL, response(ETag='"abc"'), [job])
+
+        async def scenario():
+            engine = create_async_engine("sqlite+aiosqlite://")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            stats = await CachedPageScraper(session_factory).run()
+            await engine.dispose()
+            return stats
+
+        stats = asyncio.run(scenario())
+        assert stats["jobs_found"] == 1
+        assert raw == {"id": "temp"}
+        assert cached_result(URL)[0].raw_data is raw
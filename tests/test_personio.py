@@ -0,0 +1,217 @@
+"""
+Tests for the careers-page fallback in backend/scrapers/personio.py:
+JSON-LD JobPosting extraction, and the BeautifulSoup card parse used
+when a page embeds no JSON-LD.
+"""
+import asyncio
+import sys
+import os
+
+# Allow running from project root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+pytest.importorskip("bs4")
+
+import httpx
+
+from backend.scrapers.personio import PersonioScraper
+
+
+BASE_URL = "https://acme.jobs.personio.com"
+
+GRAPH_PAGE = b"""
+<html><head>
+<script type="application/ld+json">{not json</script>
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "Organization", "name": "ACME"},
+  {"@type": "JobPosting",
+   "title": "Frontend Developer (React)",
+   "url": "https://acme.jobs.personio.com/job/1234",
+   "identifier": {"@type": "PropertyValue", "value": 1234},
+   "jobLocation": [{"@type": "Place", "address": {"addressLocality": "Valencia"}}],
+   "employmentType": ["FULL_TIME", 40]}
+]}
+</script>
+</head><body></body></html>
+"""
+
+NO_JSON_LD_PAGE = b"""
+<html><body><ul>
+  <li class="opening">
+    <a href="/job/77"><h3>Mozo de almac\xc3\xa9n</h3></a>
+    <span class="job-location">Sevilla</span>
+  </li>
+</ul></body></html>
+"""
+
+
+@pytest.fixture
+def scraper():
+    return PersonioScraper(None)
+
+
+def parse_json_ld(scraper, html: bytes) -> list[dict]:
+    return scraper._parse_json_ld(html, "acme", "fullstack_dev", "ACME", BASE_URL)
+
+
+# ===========================================================================
+# 1. JSON-LD
+# ===========================================================================
+
+class TestJsonLd:
+
+    def test_graph_job_posting_is_extracted(self, scraper):
+        jobs = parse_json_ld(scraper, GRAPH_PAGE)
+        assert len(jobs) == 1
+        job = jobs[0]
+        assert job["external_id"] == "acme_1234"
+        assert job["title"] == "Frontend Developer (React)"
+        assert job["url"] == "https://acme.jobs.personio.com/job/1234"
+        assert job["company"] == "ACME"
+        assert job["location"] == "Valencia"
+        assert job["cv_profile"] == "frontend_dev"
+
+    def test_non_string_employment_types_are_joined(self, scraper):
+        job = parse_json_ld(scraper, GRAPH_PAGE)[0]
+        assert job["contract_type"] == "FULL_TIME, 40"
+
+    def test_raw_payload_follows_store_raw(self, scraper, monkeypatch):
+        assert parse_json_ld(scraper, GRAPH_PAGE)[0]["raw_data"] is None
+        monkeypatch.setattr(PersonioScraper, "STORE_RAW", True)
+        assert parse_json_ld(scraper, GRAPH_PAGE)[0]["raw_data"]["@type"] == "JobPosting"
+
+    def test_single_object_block_is_extracted(self, scraper):
+        page = (
+            b'<script type="application/ld+json">'
+            b'{"@type": "JobPosting", "title": "Driver", "identifier": "9"}'
+            b"</script>"
+        )
+        job = parse_json_ld(scraper, page)[0]
+        assert job["external_id"] == "acme_9"
+        assert job["url"] == BASE_URL
+        assert job["location"] == "España"
+        assert job["cv_profile"] == "logistics"
+
+    def test_page_without_json_ld_yields_nothing(self, scraper):
+        assert parse_json_ld(scraper, NO_JSON_LD_PAGE) == []
+
+    def test_bad_posting_does_not_drop_the_others(self, scraper, monkeypatch):
+        original = PersonioScraper._normalise_json_ld_job
+
+        def normalise(self, raw, *args):
+            if raw.get("title") == "Broken":
+                raise ValueError("boom")
+            return original(self, raw, *args)
+
+        monkeypatch.setattr(PersonioScraper, "_normalise_json_ld_job", normalise)
+        page = (
+            b'<script type="application/ld+json">['
+            b'{"@type": "JobPosting", "title": "Broken", "identifier": "1"},'
+            b'{"@type": "JobPosting", "title": "Driver", "identifier": "2"}'
+            b"]</script>"
+        )
+        assert [job["external_id"] for job in parse_json_ld(scraper, page)] == ["acme_2"]
+
+    def test_non_string_fields_are_coerced(self, scraper):
+        page = (
+            b'<script type="application/ld+json">'
+            b'{"@type": "JobPosting", "title": "Driver", "identifier": 9,'
+            b' "url": {"href": "/job/9"}, "description": ["x"],'
+            b' "jobLocation": {"address": {"addressLocality": ["Madrid"]}},'
+            b' "employmentType": {"value": "FULL_TIME"}}'
+            b"</script>"
+        )
+        job = parse_json_ld(scraper, page)[0]
+        assert job["external_id"] == "acme_9"
+        assert job["url"] == BASE_URL
+        assert job["location"] == "España"
+        assert job["description"] is None
+        assert job["contract_type"] is None
+
+    def test_posting_with_non_string_title_is_skipped(self, scraper):
+        page = (
+            b'<script type="application/ld+json">'
+            b'{"@type": "JobPosting", "title": {"en": "Driver"}, "identifier": "9"}'
+            b"</script>"
+        )
+        assert parse_json_ld(scraper, page) == []
+
+    def test_string_address_is_used_as_location(self, scraper):
+        page = (
+            b'<script type="application/ld+json">'
+            b'{"@type": "JobPosting", "title": "Driver", "identifier": "9",'
+            b' "jobLocation": {"address": " Bilbao "}}'
+            b"</script>"
+        )
+        assert parse_json_ld(scraper, page)[0]["location"] == "Bilbao"
+
+    def test_html_description_is_stripped(self, scraper):
+        page = (
+            b'<script type="application/ld+json">'
+            b'{"@type": "JobPosting", "title": "Driver", "identifier": "9",'
+            b' "description": "<p>Reparto en <b>Madrid</b></p><ul><li>Carnet B</li></ul>"}'
+            b"</script>"
+        )
+        assert parse_json_ld(scraper, page)[0]["description"] == "Reparto en\nMadrid\nCarnet B"
+
+    def test_escaped_html_description_is_stripped(self, scraper):
+        page = (
+            b'<script type="application/ld+json">'
+            b'{"@type": "JobPosting", "title": "Driver", "identifier": "9",'
+            b' "description": "&lt;p&gt;Carnet B &amp;amp; coche&lt;/p&gt;"}'
+            b"</script>"
+        )
+        assert parse_json_ld(scraper, page)[0]["description"] == "Carnet B & coche"
+
+    def test_plain_description_is_kept(self, scraper):
+        page = (
+            b'<script type="application/ld+json">'
+            b'{"@type": "JobPosting", "title": "Driver", "identifier": "9",'
+            b' "description": "Reparto &amp; carga"}'
+            b"</script>"
+        )
+        assert parse_json_ld(scraper, page)[0]["description"] == "Reparto & carga"
+
+
+# ===========================================================================
+# 2. Careers-page fallback in _fetch_company
+# ===========================================================================
+
+class TestHtmlFallback:
+
+    def fetch(self, scraper, page: bytes) -> list[dict]:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/job-descriptions":
+                return httpx.Response(404)
+            return httpx.Response(200, content=page, headers={"Content-Type": "text/html"})
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await scraper._fetch_company(client, "acme", "fullstack_dev", "ACME")
+
+        return asyncio.run(scenario())
+
+    def test_json_ld_is_used_when_present(self, scraper):
+        jobs = self.fetch(scraper, GRAPH_PAGE)
+        assert [job["external_id"] for job in jobs] == ["acme_1234"]
+
+    def test_cards_are_parsed_when_json_ld_has_no_usable_posting(self, scraper):
+        page = (
+            b'<script type="application/ld+json">'
+            b'{"@type": "JobPosting", "title": ""}'
+            b"</script>"
+        ) + NO_JSON_LD_PAGE
+        assert [job["external_id"] for job in self.fetch(scraper, page)] == ["acme_77"]
+
+    def test_cards_are_parsed_without_json_ld(self, scraper):
+        jobs = self.fetch(scraper, NO_JSON_LD_PAGE)
+        assert len(jobs) == 1
+        job = jobs[0]
+        assert job["external_id"] == "acme_77"
+        assert job["title"] == "Mozo de almacén"
+        assert job["url"] == "https://acme.jobs.personio.com/job/77"
+        assert job["location"] == "Sevilla"
+        assert job["cv_profile"] == "logistics"
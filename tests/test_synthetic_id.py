@@ -0,0 +1,58 @@
+"""
+Tests for backend/scrapers/base.py synthetic_id.
+
+Synthetic ids are the dedup key of every job stored without a platform id,
+so the digest must match the one existing rows were written with.
+"""
+import hashlib
+import sys
+import os
+
+# Allow running from project root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.scrapers.base import synthetic_id
+from backend.scrapers.jobtoday import JobTodayScraper
+from backend.scrapers.lidl_es import LidlESScraper
+from backend.scrapers.mercadona import MercadonaScraper
+
+
+def legacy_id(raw: str) -> str:
+    """The pre-helper per-scraper digest: SHA-256 hex truncated to 32 chars."""
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+class TestSyntheticId:
+
+    def test_matches_legacy_sha256_digest(self):
+        assert synthetic_id("career_page", "acme", "cajero") == legacy_id("career_page|acme|cajero")
+
+    def test_is_32_hex_chars(self):
+        value = synthetic_id("site", "title")
+        assert len(value) == 32
+        int(value, 16)
+
+    def test_non_ascii_parts(self):
+        assert synthetic_id("mercadona", "mozo de almacén", "españa") == legacy_id(
+            "mercadona|mozo de almacén|españa"
+        )
+
+
+class TestScraperIds:
+    """Each scraper's fallback id must equal the digest it stored before."""
+
+    def test_jobtoday(self):
+        raw = {"title": "Reponedor", "company": "Dia", "location": "Madrid"}
+        assert JobTodayScraper(None)._synthetic_id(raw) == legacy_id("jobtoday|reponedor|dia|madrid")
+
+    def test_jobtoday_ignores_nested_company_and_location(self):
+        raw = {"title": "Mozo", "company": {"name": "Dia"}, "location": {"city": "Madrid"}}
+        assert JobTodayScraper(None)._synthetic_id(raw) == legacy_id("jobtoday|mozo||")
+
+    def test_lidl(self):
+        assert LidlESScraper(None)._synthetic_id("Cajero/a", "Sevilla") == legacy_id("lidl_es|cajero/a|sevilla")
+
+    def test_mercadona(self):
+        assert MercadonaScraper(None)._synthetic_id("Mozo de Almacén", "Valencia") == legacy_id(
+            "mercadona|mozo de almacén|valencia"
+        )